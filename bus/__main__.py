@@ -1,20 +1,40 @@
 #!/usr/bin/env python3
+import argparse
+import itertools
+import signal
 import sys
 import time
 import tomllib
 from pathlib import Path
 from threading import Thread
 
-import requests
 import xdg
 from pubnub.enums import PNReconnectionPolicy
 from pubnub.pubnub import PNConfiguration, PubNub, SubscribeCallback
 
 from bus.desert_bus import DesertBus
-from gdq import utils
+from bus.history import History
+from bus.ingest import Coalescer, Supervisor
+from gdq import metrics, utils
+from gdq.display.ndjson import NDJSONWriter
 from gdq.display.raw import Display
 from gdq.money import Dollar
 
+# Bursts of changes closer together than this are drawn as one frame.
+FRAME_INTERVAL = 0.2
+# Wake a little after a clock boundary so the new second is the one drawn.
+BOUNDARY_SLACK = 0.01
+
+
+def redraw_on_resize(bus: DesertBus) -> None:
+    signal.signal(signal.SIGWINCH, lambda *_: bus.changed.set())
+
+
+def wait_for_change(bus: DesertBus, last_frame: float) -> None:
+    bus.changed.wait(bus.next_change() + BOUNDARY_SLACK)
+    time.sleep(max(last_frame + FRAME_INTERVAL - time.monotonic(), 0))
+    bus.changed.clear()
+
 
 class DisplayThread(Thread):
     bus: DesertBus
@@ -24,26 +44,64 @@ class DisplayThread(Thread):
         super().__init__()
         self.bus = bus
         self.display = Display()
+        self.shown: tuple = ()
+
+    def draw(self) -> bool:
+        """Draw a frame unless it matches the one on screen. Returns whether it drew."""
+        self.display.refresh_terminal()
+        self.bus.width = self.display.term_w
+        state = self.bus.frame()
+        frame = (
+            (self.display.term_w, self.display.term_h),
+            list(self.bus.header(state)),
+            list(itertools.islice(self.bus.render(state), self.display.term_h)),
+            list(self.bus.footer(state)),
+        )
+        if frame == self.shown:
+            return False
+        _, header, body, footer = frame
+        self.display.update_header(header)
+        self.display.update_body(body)
+        self.display.update_footer(footer)
+        print(flush=True, end="")
+        self.shown = frame
+        return True
+
+    def run(self) -> None:
+        while True:
+            utils.update_now()
+            with metrics.FRAME_SECONDS.time():
+                self.draw()
+            wait_for_change(self.bus, time.monotonic())
+
+
+class SnapshotThread(Thread):
+    bus: DesertBus
+    writer: NDJSONWriter
+
+    def __init__(self, bus: DesertBus, writer: NDJSONWriter) -> None:
+        super().__init__()
+        self.bus = bus
+        self.writer = writer
 
     def run(self) -> None:
         while True:
             utils.update_now()
-            self.display.refresh_terminal()
-            self.bus.width = self.display.term_w
-            self.display.update_header(self.bus.header())
-            self.display.update_body(self.bus.render())
-            self.display.update_footer(self.bus.footer())
-            print(flush=True, end="")
-            time.sleep(0.2)
+            self.writer.emit(self.bus.snapshot())
+            wait_for_change(self.bus, time.monotonic())
 
 
 class SubscribeHandler(SubscribeCallback):
-    def __init__(self, bus: DesertBus, *args, **kwargs):
+    def __init__(self, bus: DesertBus, supervisor: Supervisor, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.bus = bus
+        self.supervisor = supervisor
 
     def message(self, pubnub, message) -> None:
-        self.bus.total = Dollar(message.message)
+        total = Dollar(message.message)
+        self.supervisor.receive(total)
+        metrics.PUBNUB_MESSAGES.inc()
+        metrics.TOTAL.set(total.to_float(), event="bus")
 
         if bool(utils.now >= self.bus.end):
             pubnub.stop()
@@ -51,6 +109,13 @@ class SubscribeHandler(SubscribeCallback):
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--ndjson", metavar="PATH",
+        help="Write JSON snapshots to PATH ('-' for stdout) instead of drawing",
+    )
+    args = parser.parse_args()
+
     config_path = Path(xdg.XDG_CONFIG_HOME) / "gdq" / "config.toml"
     with config_path.open("rb") as toml_file:
         config = tomllib.load(toml_file)
@@ -60,12 +125,29 @@ def main() -> None:
         print("No marathon named bus found")
         sys.exit(1)
 
-    bus = DesertBus(start=event_config["start"])
-    state = requests.get("https://desertbus.org/wapi/init", timeout=10).json()
-    bus.total = Dollar(state["total"])
+    if "metrics_port" in event_config:
+        metrics.serve(event_config["metrics_port"])
 
-    display = DisplayThread(bus)
-    display.start()
+    bus = DesertBus(start=event_config["start"])
+    bus.history = History(path=Path(xdg.XDG_DATA_HOME) / "gdq" / f"bus-{bus.start:%Y}.history")
+    coalescer = Coalescer(bus, window=event_config.get("coalesce_window", 0.5), history=bus.history)
+    supervisor = Supervisor(
+        coalescer,
+        quiet_after=event_config.get("quiet_after", 30),
+        stale_after=event_config.get("stale_after", 120),
+        min_interval=event_config.get("min_poll_interval", 5),
+        max_interval=event_config.get("max_poll_interval", 60),
+    )
+    supervisor.poll()
+
+    output: Thread
+    if args.ndjson:
+        output = SnapshotThread(bus, NDJSONWriter.open(args.ndjson))
+    else:
+        output = DisplayThread(bus)
+        # Redraw straight away when the terminal is resized.
+        redraw_on_resize(bus)
+    output.start()
 
     pn_config = PNConfiguration()
     pn_config.reconnect_policy = PNReconnectionPolicy.EXPONENTIAL
@@ -73,8 +155,9 @@ def main() -> None:
     pn_config.uuid = event_config["uuid"]
 
     pubnub = PubNub(pn_config)
-    pubnub.add_listener(SubscribeHandler(bus))
+    pubnub.add_listener(SubscribeHandler(bus, supervisor))
     pubnub.subscribe().channels("db_total").execute()
+    supervisor.start()
 
 
 if __name__ == "__main__":
@@ -1,13 +1,85 @@
+import bisect
+import functools
+import heapq
+import itertools
 import math
-import sys
-from collections.abc import Iterable, Iterator
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+import threading
+from array import array
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any
 
 from gdq import utils
 from gdq.models.bus_shift import SHIFTS
 from gdq.money import Dollar
 
+if TYPE_CHECKING:
+    from bus.history import History
+
+
+RATE = 1.07
+# Conversions up to this many hours are looked up rather than calculated.
+TABLE_HOURS = 300
+
+
+def _dollars_to_hours(dollars: float, rate: float) -> int:
+    # NOTE: This is not reflexive with _hours_to_dollars
+    return math.floor(math.log((dollars * (rate - 1)) + 1) / math.log(rate))
+
+
+def _hours_to_dollars(hours: int, rate: float) -> float:
+    return (1 - (rate**hours)) / (1 - rate)
+
+
+def _hour_threshold(hours: int) -> int:
+    """Find the fewest cents that _dollars_to_hours counts as `hours` hours."""
+    low = max(math.floor(_hours_to_dollars(hours, RATE) * 100) - 2, 0)
+    high = low + 4
+    while _dollars_to_hours(high / 100, RATE) < hours:
+        high += high - low
+    while high - low > 1:
+        middle = (low + high) // 2
+        if _dollars_to_hours(middle / 100, RATE) >= hours:
+            high = middle
+        else:
+            low = middle
+    return high if hours else 0
+
+
+# HOUR_THRESHOLDS[h] is the total in cents at which hour h is funded.
+HOUR_THRESHOLDS = array("q", (_hour_threshold(hours) for hours in range(TABLE_HOURS + 1)))
+HOUR_TOTALS = tuple(Dollar(_hours_to_dollars(hours, RATE)) for hours in range(TABLE_HOURS + 1))
+
+
+def dollars_to_hours(dollars: Dollar, rate: float = RATE) -> int:
+    cents = dollars.minor_units
+    if rate != RATE or not 0 <= cents < HOUR_THRESHOLDS[-1]:
+        return _dollars_to_hours(dollars.to_float(), rate)
+    return bisect.bisect_right(HOUR_THRESHOLDS, cents) - 1
+
+
+def dollars_to_hours_many(totals: Sequence[Dollar]) -> list[int]:
+    """Convert many totals at once, walking the threshold table a single time."""
+    hours = [0] * len(totals)
+    hour = 0
+    for index in sorted(range(len(totals)), key=lambda index: totals[index]):
+        cents = totals[index].minor_units
+        if not 0 <= cents < HOUR_THRESHOLDS[-1]:
+            hours[index] = dollars_to_hours(totals[index])
+            continue
+        while HOUR_THRESHOLDS[hour + 1] <= cents:
+            hour += 1
+        hours[index] = hour
+    return hours
+
+
+def hours_to_dollars(hours: int, rate: float = RATE) -> Dollar:
+    if rate != RATE or not 0 <= hours <= TABLE_HOURS:
+        return Dollar(_hours_to_dollars(hours, rate))
+    return HOUR_TOTALS[hours]
+
 
 @dataclass(order=True, frozen=True)
 class Record:
@@ -91,8 +163,31 @@ RECORDS = [
     Record(year=2021, total=Dollar(1_223_108.83)),
     Record(year=2022, total=Dollar(1_138_674.80)),
 ]
-FakeRecord = tuple[Dollar, str, bool]
-LIFETIME = sum([record.total for record in RECORDS], Dollar())
+
+
+class RecordTable:
+    """Historical records in total order, with their hour counts worked out once."""
+
+    records: tuple[Record, ...]
+    totals: tuple[Dollar, ...]
+    hours: tuple[int, ...]
+    lifetime: Dollar
+
+    def __init__(self, records: Iterable[Record]):
+        self.records = tuple(sorted(records))
+        self.totals = tuple(record.total for record in self.records)
+        self.hours = tuple(dollars_to_hours_many(self.totals))
+        self.lifetime = sum(self.totals, Dollar())
+
+    def count_above(self, total: Dollar) -> int:
+        return len(self.totals) - bisect.bisect_right(self.totals, total)
+
+    def count_passed(self, hours: float) -> int:
+        return bisect.bisect_right(self.hours, hours)
+
+
+RECORD_TABLE = RecordTable(RECORDS)
+LIFETIME = RECORD_TABLE.lifetime
 
 
 class DesertBuck(Dollar):
@@ -109,33 +204,101 @@ class DesertToonie(Dollar):
         super().__init__(value / RECORDS[1].total)
 
 
+@dataclass(frozen=True)
+class BusState:
+    """Everything a frame shows, derived from a single total."""
+
+    start: datetime
+    total: Dollar
+    hours: int
+    end: datetime
+    # The next milestones above the total
+    upcoming: tuple["Milestone", ...]
+    records_left: int
+    # The minute the estimate was projected from
+    minute: datetime
+    estimate: Dollar
+    # Hourly rate over the longest history window, and the hours it would fund
+    rate: Dollar = field(default_factory=Dollar)
+    forecast: int | None = None
+
+    def at(self, minute: datetime) -> "BusState":
+        if minute == self.minute:
+            return self
+        return replace(self, minute=minute, estimate=estimate_total(self.total, minute - self.start))
+
+
 class DesertBus:
     _start: datetime
-    total: Dollar
     offline: bool = False
     width: int = 0
+    ladder: "MilestoneLadder"
+    # Replaced wholesale on every new total, never modified, so that readers
+    # on other threads always see one consistent state without locking.
+    state: BusState
+    # Set whenever something shown on screen may have changed
+    changed: threading.Event
+    # Milestones kept in each state, enough to fill any terminal
+    upcoming_size: int = 120
+    history: "History | None" = None
+    # The last frame and the state it was taken from
+    _frame: tuple[BusState, BusState] | None = None
 
     def __init__(self, start: datetime):
         self._start = start
+        self.ladder = MilestoneLadder()
+        self.changed = threading.Event()
+        self._publish_lock = threading.Lock()
+        self.publish(Dollar())
+
+    def publish(self, total: Dollar) -> None:
+        minute = utils.now.replace(second=0, microsecond=0)
+        hours = dollars_to_hours(total)
+        rate, forecast = Dollar(), None
+        if self.history is not None:
+            rate = self.history.rate(self.history.windows[-1])
+            forecast = self.history.forecast(self.start)
+        # The ladder keeps a cursor, so publishers take turns with it.
+        with self._publish_lock:
+            self.state = BusState(
+                start=self.start,
+                total=total,
+                hours=hours,
+                end=self.start + timedelta(hours=hours),
+                upcoming=tuple(itertools.islice(self.ladder.above(total), self.upcoming_size)),
+                records_left=RECORD_TABLE.count_above(total),
+                minute=minute,
+                estimate=estimate_total(total, minute - self.start),
+                rate=rate,
+                forecast=forecast,
+            )
+        self.changed.set()
+
+    def frame(self) -> BusState:
+        """The state to draw a frame from, with the estimate for the current minute."""
+        state = self.state
+        minute = utils.now.replace(second=0, microsecond=0)
+        cached = self._frame
+        if cached is None or cached[0] is not state or cached[1].minute != minute:
+            cached = (state, state.at(minute))
+            self._frame = cached
+        return cached[1]
+
+    @property
+    def total(self) -> Dollar:
+        return self.state.total
+
+    @total.setter
+    def total(self, total: Dollar) -> None:
+        self.publish(total)
 
     @property
     def hours(self) -> int:
-        return dollars_to_hours(self.total)
+        return self.state.hours
 
     @property
     def estimate(self) -> Dollar:
-        future_hours = 0
-        future_total = self.total
-        while future_hours != dollars_to_hours(future_total):
-            future_hours = dollars_to_hours(future_total)
-            if utils.now > self.start:
-                future_multiplier = timedelta(hours=future_hours) / (
-                    utils.now - self.start
-                )
-            else:
-                future_multiplier = 1
-            future_total = self.total * future_multiplier
-        return future_total
+        return self.frame().estimate
 
     @property
     def start(self) -> datetime:
@@ -143,43 +306,71 @@ class DesertBus:
 
     @property
     def end(self) -> datetime:
-        return self.start + timedelta(hours=self.hours)
-
-    def header(self, *, extended: bool = False) -> Iterable[str]:
+        return self.state.end
+
+    def next_change(self, timestamp: datetime | None = None) -> float:
+        """Seconds until the clock alone would change what is displayed."""
+        timestamp = timestamp or datetime.now(timezone.utc)
+        if timestamp < self.start:
+            # Counting down to the start by the second
+            return 1 - timestamp.microsecond / 1_000_000
+
+        # Shifts and the estimate follow the wall clock, elapsed time follows the start.
+        wall_clock = 60 - timestamp.second - timestamp.microsecond / 1_000_000
+        elapsed = 60 - (timestamp - self.start).total_seconds() % 60
+        return min(wall_clock, elapsed)
+
+    def snapshot(self) -> dict[str, Any]:
+        state = self.frame()
+        snapshot = {
+            "start": self.start.isoformat(),
+            "end": state.end.isoformat(),
+            "total": state.total.to_float(),
+            "hours": state.hours,
+            "estimate": state.estimate.to_float(),
+            "estimated_hours": dollars_to_hours(state.estimate),
+            "lifetime": (state.total + LIFETIME).to_float(),
+        }
+        if self.history is not None:
+            snapshot["rates"] = {f"{window}s": rate.to_float() for window, rate in self.history.rates().items()}
+            snapshot["forecast_hours"] = state.forecast
+        return snapshot
+
+    def header(self, state: BusState, *, extended: bool = False) -> Iterable[str]:
         if utils.now < self.start:
             yield f"Starting in {self.start - utils.now}".center(self.width)
-        elif utils.now < (self.start + timedelta(hours=self.hours + 1)):
-            yield self.shift_banners(utils.now)
+        elif utils.now < (self.start + timedelta(hours=state.hours + 1)):
+            yield self.shift_banners(state, utils.now)
         else:
             yield "It's over!"
 
-        yield "|".join(
-            even_banner(
-                [
-                    str(self.total),
-                    f"{self.hours} hours",
-                    str(DesertBuck(self.total)),
-                    str(DesertToonie(self.total)),
-                ],
-                self.width,
+        yield joined_banner(
+            (
+                f"{state.total} (offline)" if self.offline else str(state.total),
+                f"{state.hours} hours",
+                str(DesertBuck(state.total)),
+                str(DesertToonie(state.total)),
             ),
+            self.width,
         )
         if extended:
             totals = []
             if utils.now > self.start:
-                estimate = self.estimate
+                estimate = state.estimate
                 totals.append(f"{estimate} estimated ({dollars_to_hours(estimate)}h)")
-            totals.append(f"{self.total + LIFETIME} lifetime")
-            yield "|".join(even_banner(totals, self.width))
+                if state.forecast is not None and state.rate:
+                    totals.append(f"{state.forecast}h at {state.rate.short}/h")
+            totals.append(f"{state.total + LIFETIME} lifetime")
+            yield joined_banner(tuple(totals), self.width)
 
-    def render(self) -> Iterable[str]:
-        if utils.now < self.start + (timedelta(hours=(self.hours + 1))):
-            yield from self.print_records()
+    def render(self, state: BusState) -> Iterable[str]:
+        if utils.now < self.start + (timedelta(hours=(state.hours + 1))):
+            yield from self.print_records(state)
 
-    def footer(self, *, overall: bool = False) -> Iterable[str]:
+    def footer(self, state: BusState, *, overall: bool = False) -> Iterable[str]:
         start = self.start
         elapsed = max(utils.now - start, timedelta())
-        total = timedelta(hours=self.hours)
+        total = timedelta(hours=state.hours)
         remaining = min(start + total - utils.now, total)
 
         hours_done = f"[{utils.timedelta_as_hours(elapsed)}]"
@@ -187,23 +378,11 @@ class DesertBus:
         progress_width = self.width - len(hours_done) - len(hours_left) - 3
 
         # Scaled to last passed record
-        last_record = timedelta()
-        future_stops = []
-
-        for record in sorted(RECORDS):
-            td_record = timedelta(hours=dollars_to_hours(record.total))
-            if td_record <= elapsed:
-                # We've passed this record, but make a note that we've come this far.
-                last_record = td_record
-            elif td_record < total:
-                # In the future, but still on the hook for it.
-                future_stops.append(td_record)
-            else:
-                # Don't worry about records we havent reached yet.
-                break
-
-        if overall:
-            last_record = timedelta()
+        elapsed_hours = elapsed / timedelta(hours=1)
+        passed = RECORD_TABLE.count_passed(elapsed_hours)
+        last_record = timedelta(hours=RECORD_TABLE.hours[passed - 1]) if passed and not overall else timedelta()
+        # Records still ahead of us, but that we're already on the hook for.
+        future_stops = itertools.takewhile(lambda hours: hours < state.hours, RECORD_TABLE.hours[passed:])
 
         try:
             completed_width = math.floor(
@@ -211,120 +390,202 @@ class DesertBus:
             )
         except ZeroDivisionError:
             completed_width = 0
-        progress = (
-            f"{'─' * completed_width}🚍{' ' * (progress_width - completed_width - 1)}🏁"
-        )
+        cells = ["─"] * completed_width + ["🚍"] + [" "] * (progress_width - completed_width - 1) + ["🏁"]
 
+        # A stop is drawn two columns wide, so it takes the place of two spaces.
+        # Stop locations count characters rather than cells, so each stop
+        # already placed pushes the later ones one cell to the right.
+        placed = 0
         for stop in future_stops:
             stop_location = math.floor(
-                (last_record - stop) / (last_record - total) * progress_width,
+                (last_record - timedelta(hours=stop)) / (last_record - total) * progress_width,
             )
-            if progress[stop_location : stop_location + 2] == "  ":
-                progress = (
-                    progress[:stop_location] + "🚏" + progress[stop_location + 2 :]
-                )
+            cell = stop_location + placed
+            if cells[cell:cell + 2] == [" ", " "]:
+                cells[cell:cell + 2] = ["🚏", ""]
+                placed += 1
+        progress = "".join(cells)
 
         yield f"{hours_done}{progress}{hours_left}"
 
-    def shift_banners(self, timestamp: datetime) -> str:
+    def shift_banners(self, state: BusState, timestamp: datetime) -> str:
         # Shift detection
-        if timestamp > self.end - timedelta(hours=4):
-            return "|".join(even_banner(list("OMEGA"), self.width))
-
-        banners = even_banner(
-            [shift.name for shift in SHIFTS],
-            self.width,
-            fill_char="═",
-        )
-
-        for index, shift in enumerate(SHIFTS):
-            boldness = 2
-            if shift.is_active(timestamp):
-                boldness = 7
-            banners[index] = f"{shift.color};{boldness}m{banners[index]}\x1b[0m"
-
-        return "|".join(banners)
-
-    def print_records(self) -> Iterable[str]:
-        others = self.artificial_records()
-        next_other = next(others)
-        while next_other[0] <= self.total:
-            next_other = next(others)
-
-        next_level = Dollar()
-        for event in sorted(RECORDS):
-            if event.total > self.total:
-                while next_other[0] < event.total:
-                    yield f"{next_other[0] - self.total} until {next_other[1]}"
-                    if not next_other[2]:
-                        return
-                    next_other = next(others)
-
-                yield event.distance(self.total)
-                next_level = event.total
-
-        if next_level == Dollar():
+        if timestamp > state.end - timedelta(hours=4):
+            return shift_banner(self.width, None)
+        return shift_banner(self.width, tuple(shift.is_active(timestamp) for shift in SHIFTS))
+
+    def print_records(self, state: BusState) -> Iterable[str]:
+        estimate = state.estimate
+        current = Milestone(total=estimate, rank=1, label=f"current estimate ({estimate})")
+        upcoming: Iterable[Milestone] = state.upcoming
+        if estimate > state.total:
+            upcoming = heapq.merge(upcoming, [current])
+
+        records_left = state.records_left
+        if not records_left:
             yield "NEW RECORD!"
 
-        while True:
-            yield f"{next_other[0] - self.total} until {next_other[1]}"
-            next_other = next(others)
+        for milestone in upcoming:
+            if milestone.record:
+                yield milestone.record.distance(state.total)
+                records_left -= 1
+                continue
 
-    def artificial_records(self) -> Iterator[FakeRecord]:
-        records: list[tuple[FakeRecord, Iterator[FakeRecord]]] = [
-            (
-                (self.estimate, f"current estimate ({self.estimate})", False),
-                iter(lambda: (Dollar(sys.maxsize), "", True), 0),
-            ),
-        ]
+            yield f"{milestone.total - state.total} until {milestone.label}"
+            # Past the estimate, only show further records once there are none left to beat.
+            if milestone is current and records_left:
+                return
 
-        hours = self.next_hours()
-        records.append((next(hours), hours))
-        numbers = self.fun_numbers()
-        records.append((next(numbers), numbers))
-        lifetimes = self.fun_numbers(lifetime=True)
-        records.append((next(lifetimes), lifetimes))
 
+@dataclass(order=True, frozen=True)
+class Milestone:
+    total: Dollar
+    # Historical records sort ahead of other milestones at the same total.
+    rank: int
+    label: str
+    record: Record | None = field(default=None, compare=False)
+
+
+def hour_milestones() -> Iterator[Milestone]:
+    hour = 1
+    while True:
+        label = f"hour {hour}"
+        if hour % 24 == 0:
+            label += f" ({hour // 24} days!)"
+        yield Milestone(total=hours_to_dollars(hour), rank=1, label=label)
+        hour += 1
+
+
+def fun_milestones(*, lifetime: bool = False) -> Iterator[Milestone]:
+    zeroes = 0
+    while True:
+        for fives in range(2, 20):
+            current = Dollar(fives * 5 * 10**zeroes)
+            if not lifetime:
+                yield Milestone(total=current, rank=1, label=str(current))
+            elif current > LIFETIME:
+                yield Milestone(total=current - LIFETIME, rank=1, label=f"{current} lifetime")
+        zeroes += 1
+
+
+class MilestoneLadder:
+    """Every record, hour and round number the total can pass, in order.
+
+    Sources are merged once and the ladder is extended lazily as the total
+    climbs, so a frame only has to slice it from the first milestone above
+    the current total.
+    """
+
+    milestones: list[Milestone]
+    # Extend the ladder this many milestones at a time.
+    chunk: int = 64
+
+    def __init__(self):
+        records = [
+            Milestone(total=record.total, rank=0, label=str(record), record=record) for record in RECORD_TABLE.records
+        ]
+        self._sources = heapq.merge(records, hour_milestones(), fun_milestones(), fun_milestones(lifetime=True))
+        self.milestones = []
+        self._cursor = 0
+
+    def _extend(self) -> None:
+        self.milestones.extend(itertools.islice(self._sources, self.chunk))
+
+    def _seek(self, total: Dollar) -> int:
+        cursor = self._cursor
+        if cursor and self.milestones[cursor - 1].total > total:
+            # The total went down, which is rare enough to search from scratch.
+            cursor = bisect.bisect_right(self.milestones, total, key=attrgetter("total"))
         while True:
-            records.sort()
-            value, generator = records.pop(0)
-            records.append((next(generator), generator))
-            yield value
+            while cursor < len(self.milestones) and self.milestones[cursor].total <= total:
+                cursor += 1
+            if cursor < len(self.milestones):
+                break
+            self._extend()
+        self._cursor = cursor
+        return cursor
 
-    def next_hours(self) -> Iterator[FakeRecord]:
-        hour = dollars_to_hours(self.total) + 1
+    def above(self, total: Dollar) -> Iterator[Milestone]:
+        index = self._seek(total)
         while True:
-            if hour % 24 == 0:
-                yield hours_to_dollars(
-                    hour,
-                ), f"hour {hour} ({hour // 24} days!)", True
+            if index == len(self.milestones):
+                self._extend()
+            yield self.milestones[index]
+            index += 1
+
+
+@functools.lru_cache(maxsize=32)
+def estimate_total(total: Dollar, elapsed: timedelta) -> Dollar:
+    """Project the final total if donations keep their average pace so far.
+
+    That is the total at the hour count h where raising money at the current
+    rate for h hours buys exactly h hours.
+    """
+    hours = dollars_to_hours(total)
+    if elapsed <= timedelta() or not hours:
+        return total
+
+    def projected(hours: int) -> Dollar:
+        return total * (timedelta(hours=hours) / elapsed)
+
+    return projected(nearest_funded_hours(lambda hours: dollars_to_hours(projected(hours)), hours))
+
+
+def nearest_funded_hours(funded: Callable[[int], int], hours: int) -> int:
+    """Find the hour count nearest `hours` that funds exactly itself.
+
+    `funded` gives the hours paid for if the bus runs for the given number of
+    hours. It must never decrease, which lets the answer be bracketed and then
+    bisected rather than iterated towards.
+    """
+    if funded(hours) > hours:
+        # Gallop up to an hour count that funds no more than itself.
+        low, step = hours, 1
+        while funded(hours + step) > hours + step:
+            low = hours + step
+            step *= 2
+        high = hours + step
+        while high - low > 1:
+            middle = (low + high) // 2
+            if funded(middle) > middle:
+                low = middle
             else:
-                yield hours_to_dollars(hour), f"hour {hour}", True
-            hour += 1
+                high = middle
+        return high
+
+    if funded(hours) == hours:
+        return hours
+
+    # Running behind the clock: walk down to an hour count that is still funded.
+    low, high = 0, hours
+    while high - low > 1:
+        middle = (low + high) // 2
+        if funded(middle) >= middle:
+            low = middle
+        else:
+            high = middle
+    return low
 
-    def fun_numbers(self, *, lifetime: bool = False) -> Iterator[FakeRecord]:
-        zeroes = 0
-        while True:
-            for fives in range(2, 20):
-                current = Dollar(fives * 5 * 10**zeroes)
-                if lifetime:
-                    if self.total + LIFETIME < current:
-                        yield current - LIFETIME, f"{current} lifetime", True
-                elif self.total < current:
-                    yield current, str(current), True
-            zeroes += 1
 
+@functools.lru_cache(maxsize=64)
+def shift_banner(width: int, active: tuple[bool, ...] | None) -> str:
+    """The shift row, with active shifts in bold, or OMEGA when `active` is None."""
+    if active is None:
+        return joined_banner(tuple("OMEGA"), width)
 
-def dollars_to_hours(dollars: Dollar, rate: float = 1.07) -> int:
-    # NOTE: This is not reflexive with hours_to_dollats
-    return math.floor(math.log((dollars.to_float() * (rate - 1)) + 1) / math.log(rate))
+    banners = even_banner([shift.name for shift in SHIFTS], width, fill_char="═")
+    return "|".join(
+        f"{shift.color};{7 if is_active else 2}m{banner}\x1b[0m"
+        for shift, banner, is_active in zip(SHIFTS, banners, active, strict=True)
+    )
 
 
-def hours_to_dollars(hours: int, rate: float = 1.07) -> Dollar:
-    return Dollar((1 - (rate**hours)) / (1 - rate))
+@functools.lru_cache(maxsize=256)
+def joined_banner(items: tuple[str, ...], width: int) -> str:
+    return "|".join(even_banner(items, width))
 
 
-def even_banner(items: list[str], width: int = 80, fill_char: str = " ") -> list[str]:
+def even_banner(items: Sequence[str], width: int = 80, fill_char: str = " ") -> list[str]:
     width -= len(items) - 1
     min_width = sum(len(s) for s in items)
     # reflow is extra spaces that should be distributed amongst the
@@ -340,12 +601,13 @@ def even_banner(items: list[str], width: int = 80, fill_char: str = " ") -> list
         # reflow is positive, an extra space will be added
         reflow = width - (shift_width * len(items))
 
+    banners = []
     for index, stat in enumerate(items):
         mod = 0
         if reflow < 0 and index == len(items) - 1:
             mod = len(items) - reflow
         elif int(index * reflow / len(items)) > int((index - 1) * reflow / len(items)):
             mod = 1
-        items[index] = stat.center(shift_width + mod, fill_char)
+        banners.append(stat.center(shift_width + mod, fill_char))
 
-    return items
+    return banners
@@ -0,0 +1,117 @@
+import struct
+import threading
+from array import array
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import BinaryIO
+
+from bus.desert_bus import dollars_to_hours, nearest_funded_hours
+from gdq.money import Dollar
+
+# One sample on disk: a POSIX timestamp and a total in cents
+SAMPLE = struct.Struct("<dq")
+# Rolling rate windows, in seconds
+WINDOWS = (5 * 60, 60 * 60, 6 * 60 * 60)
+
+
+class History:
+    """A bounded ring buffer of (timestamp, total) samples.
+
+    Each rate window keeps the position of its oldest sample, which only ever
+    moves forward, so appending and reading a rate are both constant time.
+    Samples can also be appended to a file and read back after a restart.
+    """
+
+    capacity: int
+    windows: tuple[int, ...]
+    timestamps: array
+    totals: array
+    path: Path | None
+    _file: BinaryIO | None
+
+    def __init__(self, capacity: int = 100_000, windows: tuple[int, ...] = WINDOWS, path: Path | None = None):
+        self.capacity = capacity
+        self.windows = windows
+        self.timestamps = array("d", bytes(8 * capacity))
+        self.totals = array("q", bytes(8 * capacity))
+        # Samples are numbered from 0 as they arrive; sample n lives at n % capacity.
+        self._count = 0
+        self._window_starts = dict.fromkeys(windows, 0)
+        self._lock = threading.Lock()
+        self.path = path
+        self._file = None
+        if path is not None:
+            self._load(path)
+            self._file = path.open("ab")
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    def _load(self, path: Path) -> None:
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            return
+
+        data = path.read_bytes()
+        # Ignore a partly written final sample.
+        usable = len(data) - len(data) % SAMPLE.size
+        first = max(usable // SAMPLE.size - self.capacity, 0)
+        for timestamp, cents in SAMPLE.iter_unpack(data[first * SAMPLE.size:usable]):
+            self._append(timestamp, cents)
+
+    def append(self, timestamp: float, total: Dollar) -> None:
+        with self._lock:
+            self._append(timestamp, total.minor_units)
+            if self._file is not None:
+                self._file.write(SAMPLE.pack(timestamp, total.minor_units))
+                self._file.flush()
+
+    def _append(self, timestamp: float, cents: int) -> None:
+        slot = self._count % self.capacity
+        self.timestamps[slot] = timestamp
+        self.totals[slot] = cents
+        self._count += 1
+
+        oldest = self._count - len(self)
+        for window, start in self._window_starts.items():
+            start = max(start, oldest)
+            while self.timestamps[start % self.capacity] < timestamp - window:
+                start += 1
+            self._window_starts[window] = start
+
+    @property
+    def latest(self) -> tuple[float, Dollar] | None:
+        if not self._count:
+            return None
+        slot = (self._count - 1) % self.capacity
+        return self.timestamps[slot], Dollar(self.totals[slot] / 100)
+
+    def rate(self, window: int) -> Dollar:
+        """Dollars raised per hour over the last `window` seconds."""
+        with self._lock:
+            if not self._count:
+                return Dollar()
+            first = self._window_starts[window] % self.capacity
+            last = (self._count - 1) % self.capacity
+            elapsed = self.timestamps[last] - self.timestamps[first]
+            if elapsed <= 0:
+                return Dollar()
+            return Dollar((self.totals[last] - self.totals[first]) / 100 / elapsed * 3600)
+
+    def rates(self) -> dict[int, Dollar]:
+        return {window: self.rate(window) for window in self.windows}
+
+    def forecast(self, start: datetime, window: int | None = None) -> int | None:
+        """Final hour count if donations continue at the rate over `window`."""
+        latest = self.latest
+        if latest is None:
+            return None
+        timestamp, total = latest
+        hourly = self.rate(window or self.windows[-1])
+        elapsed = datetime.fromtimestamp(timestamp, tz=start.tzinfo) - start
+
+        def funded(hours: int) -> int:
+            to_go = max(timedelta(hours=hours) - elapsed, timedelta())
+            return dollars_to_hours(total + hourly * (to_go / timedelta(hours=1)))
+
+        return nearest_funded_hours(funded, dollars_to_hours(total))
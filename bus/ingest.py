@@ -0,0 +1,170 @@
+import threading
+import time
+
+import requests
+
+from bus.desert_bus import DesertBus
+from bus.history import History
+from gdq import metrics, transport
+from gdq.money import Dollar
+
+INIT_URL = "https://desertbus.org/wapi/init"
+
+
+class Coalescer:
+    """Fold bursts of incoming totals into at most one publish per window.
+
+    A total arriving after a quiet spell is published straight away. During
+    a burst only the latest total is kept, and it is published when the
+    window since the previous publish closes. Every total received is still
+    recorded in the history.
+    """
+
+    bus: DesertBus
+    window: float
+    history: History
+
+    def __init__(self, bus: DesertBus, window: float = 0.5, history: History | None = None):
+        self.bus = bus
+        self.window = window
+        self.history = history if history is not None else History()
+        self._lock = threading.Lock()
+        self._pending: Dollar | None = None
+        self._timer: threading.Timer | None = None
+        self._last_publish = 0.0
+
+    def receive(self, total: Dollar, timestamp: float | None = None) -> None:
+        if timestamp is None:
+            timestamp = time.time()
+
+        with self._lock:
+            self.history.append(timestamp, total)
+
+            self._pending = total
+            if self._timer is not None:
+                # A publish is already scheduled and will pick this total up.
+                return
+
+            wait = self._last_publish + self.window - time.monotonic()
+            if wait > 0:
+                self._timer = threading.Timer(wait, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+                return
+
+        self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            total, self._pending = self._pending, None
+            self._timer = None
+            if total is None:
+                return
+            self._last_publish = time.monotonic()
+            # Publish under the lock so totals can't be published out of order.
+            self.bus.publish(total)
+
+
+class Supervisor(threading.Thread):
+    """Poll for the total whenever PubNub has been quiet for too long.
+
+    Polls are conditional, and back off while the total is unchanged or the
+    server is unreachable. Once PubNub messages resume, polling stops. When
+    neither source has confirmed the total for `stale_after` seconds, the
+    bus is marked offline.
+    """
+
+    coalescer: Coalescer
+    # Seconds of PubNub silence before polling starts
+    quiet_after: float
+    stale_after: float
+    min_interval: float
+    max_interval: float
+    interval: float
+
+    def __init__(
+        self,
+        coalescer: Coalescer,
+        quiet_after: float = 30,
+        stale_after: float = 120,
+        min_interval: float = 5,
+        max_interval: float = 60,
+    ):
+        super().__init__(daemon=True)
+        self.coalescer = coalescer
+        self.quiet_after = quiet_after
+        self.stale_after = stale_after
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self._validators: dict[str, str] = {}
+        self._heard = {"pubnub": time.monotonic(), "poll": 0.0}
+
+    @property
+    def bus(self) -> DesertBus:
+        return self.coalescer.bus
+
+    def heard(self, source: str) -> None:
+        self._heard[source] = time.monotonic()
+        self.check_stale()
+
+    def receive(self, total: Dollar) -> None:
+        """Pass on a total from PubNub."""
+        self.coalescer.receive(total)
+        self.heard("pubnub")
+
+    def check_stale(self) -> None:
+        offline = time.monotonic() - max(self._heard.values()) > self.stale_after
+        if offline != self.bus.offline:
+            self.bus.offline = offline
+            self.bus.changed.set()
+
+    def poll(self) -> bool:
+        """Fetch the total if it has changed. Returns whether it had."""
+        headers = {}
+        if "ETag" in self._validators:
+            headers["If-None-Match"] = self._validators["ETag"]
+        if "Last-Modified" in self._validators:
+            headers["If-Modified-Since"] = self._validators["Last-Modified"]
+
+        response = transport.get(INIT_URL, "init", headers=headers)
+        if response.status_code == 304:
+            metrics.BUS_POLLS.inc(result="unchanged")
+            self.heard("poll")
+            return False
+        response.raise_for_status()
+
+        self._validators = {
+            name: response.headers[name] for name in ("ETag", "Last-Modified") if name in response.headers
+        }
+        total = Dollar(response.json()["total"])
+        metrics.TOTAL.set(total.to_float(), event="bus")
+        self.heard("poll")
+        if total == self.bus.total:
+            metrics.BUS_POLLS.inc(result="unchanged")
+            return False
+        metrics.BUS_POLLS.inc(result="changed")
+        self.coalescer.receive(total)
+        return True
+
+    def backoff(self, changed: bool) -> None:
+        if changed:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * 2, self.max_interval)
+
+    def run(self) -> None:
+        while True:
+            quiet = time.monotonic() - self._heard["pubnub"]
+            if quiet < self.quiet_after:
+                # PubNub is live; start again from the shortest interval next time.
+                self.interval = self.min_interval
+                time.sleep(self.quiet_after - quiet)
+            else:
+                try:
+                    self.backoff(self.poll())
+                except (requests.RequestException, ValueError, KeyError):
+                    metrics.BUS_POLLS.inc(result="error")
+                    self.backoff(changed=False)
+                time.sleep(self.interval)
+            self.check_stale()
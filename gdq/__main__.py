@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 import argparse
+import atexit
+import contextlib
+import math
 import sys
+import time
 from collections.abc import Mapping
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -9,29 +13,54 @@ from typing import Any, Optional
 import toml
 import xdg
 
-from gdq import runners, utils
+from gdq import daemon, dashboard, metrics, runners, transport, utils
+from gdq.display import viewport
+from gdq.display.ndjson import NDJSONWriter
 from gdq.display.raw import Display
 from gdq.events import Marathon
+from gdq.polling import Poller
 
 
-def refresh_event(marathon: Marathon, base_args: argparse.Namespace, event_args: argparse.Namespace) -> bool:
+def refresh_event(
+        marathon: Marathon, base_args: argparse.Namespace, event_args: argparse.Namespace, poller: Poller) -> bool:
     # Recaclulate terminal size
     marathon.refresh_all()
 
-    for _ in utils.slow_refresh_with_progress(base_args.interval):
+    for _ in utils.slow_refresh_with_progress(poller.update(marathon)):
         # Update current time for display.
         utils.update_now()
 
-        display = Display()
-        display.update_header(marathon.header(width=display.term_w, args=event_args))
-        display.update_body(marathon.render(width=display.term_w, args=event_args))
-        display.update_footer(marathon.footer(width=display.term_w, args=event_args))
+        with metrics.FRAME_SECONDS.time():
+            display = Display()
+            header = list(marathon.header(width=display.term_w, args=event_args))
+            footer = list(marathon.footer(width=display.term_w, args=event_args))
+            body_height = max(display.term_h - len(header) - len(footer), 1)
+            if hasattr(marathon, "viewport"):
+                marathon.viewport.page = body_height
+            display.update_header(header)
+            display.update_body(marathon.render(width=display.term_w, args=event_args, height=body_height))
+            display.update_footer(footer)
         if base_args.oneshot:
             return False
 
     return bool(utils.now <= marathon.end)
 
 
+def stream_event(
+        marathon: Marathon, base_args: argparse.Namespace, event_args: argparse.Namespace,
+        writer: NDJSONWriter, poller: Poller) -> bool:
+    marathon.refresh_all()
+
+    for _ in range(math.ceil(poller.update(marathon))):
+        utils.update_now()
+        writer.emit(marathon.snapshot(args=event_args))
+        if base_args.oneshot:
+            return False
+        time.sleep(1)
+
+    return bool(utils.now <= marathon.end)
+
+
 def list_events(config: Mapping[str, Any]) -> None:
     event_times: dict[str, tuple[datetime, Optional[datetime]]] = {}
     for name, marathon_config in utils.show_iterable_progress(config.items(), offset=1):
@@ -53,17 +82,75 @@ def list_events(config: Mapping[str, Any]) -> None:
             print(f"{name} is ongoing")
 
 
+def show_dashboard(config: Mapping[str, Any], base_args: argparse.Namespace) -> None:
+    try:
+        dashboard.run(config, base_args)
+    except KeyError as exc:
+        print(str(exc))
+        sys.exit(2)
+    except KeyboardInterrupt:
+        pass
+
+
+def follow(marathon: Marathon, base_args: argparse.Namespace, event_args: argparse.Namespace) -> None:
+    """Refresh and show `marathon` until it ends."""
+    writer = None
+    if base_args.ndjson:
+        utils.quiet = True
+        writer = NDJSONWriter.open(base_args.ndjson)
+    elif hasattr(marathon, "viewport"):
+        viewport.listen(marathon.viewport)
+
+    poller = Poller.from_args(base_args)
+    active = True
+    while active:
+        try:
+            if writer:
+                active = stream_event(marathon, base_args, event_args, writer, poller)
+            else:
+                active = refresh_event(marathon, base_args, event_args, poller)
+        except KeyboardInterrupt:
+            break
+
+
+def print_transfers() -> None:
+    transfers = transport.transfers()
+    if not transfers:
+        return
+    # stderr, to stay out of the way of --ndjson output on stdout
+    print(f"{'resource':<16}{'requests':>10}{'wire bytes':>14}{'decoded bytes':>15}{'saved':>8}", file=sys.stderr)
+    for resource, transfer in sorted(transfers.items()):
+        print(
+            f"{resource:<16}{transfer.requests:>10}{transfer.wire:>14,}{transfer.decoded:>15,}{transfer.saved:>8.0%}",
+            file=sys.stderr,
+        )
+
+
 def main() -> None:
+    base_parser = runners.get_base_parser()
+    base_args, extra_args = base_parser.parse_known_args()
+
+    if base_args.attach:
+        with contextlib.suppress(KeyboardInterrupt):
+            daemon.attach(base_args.attach, extra_args, snapshots=bool(base_args.ndjson))
+        sys.exit(0)
+
     with open(Path(xdg.XDG_CONFIG_HOME) / "gdq" / "config.toml") as toml_file:
         config = toml.load(toml_file)
 
-    base_parser = runners.get_base_parser()
-    base_args, extra_args = base_parser.parse_known_args()
+    if base_args.metrics_port:
+        metrics.serve(base_args.metrics_port)
+    if base_args.stats:
+        atexit.register(print_transfers)
 
     if base_args.list:
         list_events(config)
         sys.exit(0)
 
+    if base_args.dashboard:
+        show_dashboard(config, base_args)
+        sys.exit(0)
+
     event_config = config.get(base_args.stream_name)
     if event_config is None:
         print(f"No marathon named {base_args.stream_name} found")
@@ -77,12 +164,12 @@ def main() -> None:
         print(str(exc))
         sys.exit(2)
 
-    active = True
-    while active:
-        try:
-            active = refresh_event(marathon, base_args, runner.args)
-        except KeyboardInterrupt:
-            break
+    if base_args.serve:
+        with contextlib.suppress(KeyboardInterrupt):
+            daemon.serve(base_args.serve, marathon, runner, base_args)
+        sys.exit(0)
+
+    follow(marathon, base_args, runner.args)
 
 
 if __name__ == "__main__":
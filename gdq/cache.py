@@ -0,0 +1,99 @@
+"""
+A cache shared by every gdq process on the host.
+
+Entries live in one SQLite database, which gives atomic writes and safe
+concurrent readers. Fetchers additionally take a per-key file lock so that
+when several processes want the same resource, one fetches it and the
+rest wait and reuse the stored copy.
+"""
+import fcntl
+import hashlib
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+import xdg
+
+
+@dataclass(frozen=True)
+class Entry:
+    value: bytes
+    validator: str
+    # Wall-clock time of the last successful fetch or revalidation
+    fetched: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched
+
+
+class SharedCache:
+    path: Path
+
+    def __init__(self, path: Path | None = None):
+        if path is None:
+            path = Path(xdg.XDG_CACHE_HOME) / "gdq" / "cache.sqlite3"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._local = threading.local()
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        # SQLite connections may not be shared between threads.
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, validator TEXT NOT NULL, fetched REAL NOT NULL)",
+            )
+            self._local.db = db
+        return db
+
+    def get(self, key: str) -> Entry | None:
+        row = self._db.execute("SELECT value, validator, fetched FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return Entry(value=row[0], validator=row[1], fetched=row[2])
+
+    def put(self, key: str, value: bytes, validator: str = "") -> Entry:
+        entry = Entry(value=value, validator=validator, fetched=time.time())
+        self._db.execute(
+            "INSERT OR REPLACE INTO entries (key, value, validator, fetched) VALUES (?, ?, ?, ?)",
+            (key, entry.value, entry.validator, entry.fetched),
+        )
+        return entry
+
+    def touch(self, key: str) -> None:
+        """Mark an entry as fresh after the server confirmed it is unchanged."""
+        self._db.execute("UPDATE entries SET fetched = ? WHERE key = ?", (time.time(), key))
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        """Hold an exclusive lock on `key` across all processes on this host."""
+        digest = hashlib.sha1(key.encode(), usedforsecurity=False).hexdigest()
+        lock_path = self.path.parent / "locks" / f"{digest}.lock"
+        lock_path.parent.mkdir(exist_ok=True)
+        with lock_path.open("a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+_shared: SharedCache | None = None
+_shared_lock = threading.Lock()
+
+
+def shared() -> SharedCache:
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = SharedCache()
+        return _shared
@@ -0,0 +1,151 @@
+"""
+What changed between two refreshes.
+"""
+from collections import Counter, defaultdict, deque
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
+
+from gdq.models import ChoiceIncentive, DonationIncentive, Incentive, Run
+from gdq.parsers.schedule_file import ScheduleFile
+
+# Kinds of incentive change
+ADDED = "added"
+REMOVED = "removed"
+TOTAL = "total"
+GOAL_MET = "goal_met"
+CLOSED = "closed"
+LEADER = "leader"
+OPTION_ADDED = "option_added"
+# Any other edit, such as a new description
+EDITED = "edited"
+# Kinds of run change, besides ADDED, REMOVED and EDITED
+RETIMED = "retimed"
+
+
+@dataclass(frozen=True)
+class IncentiveChange:
+    kind: str
+    incentive_id: int
+    # The incentive as of the newer refresh, or the removed one
+    incentive: Incentive
+    detail: str = ""
+
+
+def leader(incentive: ChoiceIncentive) -> str:
+    if not incentive.options:
+        return ""
+    return max(incentive.options, key=lambda option: option.total).name
+
+
+def _choice_changes(previous: ChoiceIncentive, incentive: ChoiceIncentive) -> Iterator[IncentiveChange]:
+    if leader(previous) != leader(incentive):
+        yield IncentiveChange(LEADER, incentive.incentive_id, incentive, leader(incentive))
+    known = {option.name for option in previous.options}
+    for option in incentive.options:
+        if option.name not in known:
+            yield IncentiveChange(OPTION_ADDED, incentive.incentive_id, incentive, option.name)
+
+
+def _edits(previous: Incentive, incentive: Incentive) -> Iterator[IncentiveChange]:
+    incentive_id = incentive.incentive_id
+    if previous.current != incentive.current:
+        yield IncentiveChange(TOTAL, incentive_id, incentive, f"{previous.current} → {incentive.current}")
+    if (
+        isinstance(previous, DonationIncentive) and isinstance(incentive, DonationIncentive)
+        and previous.current < incentive.total <= incentive.current
+    ):
+        yield IncentiveChange(GOAL_MET, incentive_id, incentive, str(incentive.total))
+    if incentive.closed and not previous.closed:
+        yield IncentiveChange(CLOSED, incentive_id, incentive)
+    if isinstance(previous, ChoiceIncentive) and isinstance(incentive, ChoiceIncentive):
+        yield from _choice_changes(previous, incentive)
+
+
+def diff_incentives(old: Mapping[int, Incentive], new: Mapping[int, Incentive]) -> list[IncentiveChange]:
+    """Changes from `old` to `new`, both keyed by incentive id."""
+    changes = []
+    for incentive_id, incentive in new.items():
+        previous = old.get(incentive_id)
+        if previous is None:
+            changes.append(IncentiveChange(ADDED, incentive_id, incentive))
+        elif previous != incentive:
+            edits = list(_edits(previous, incentive))
+            changes.extend(edits or [IncentiveChange(EDITED, incentive_id, incentive)])
+
+    changes.extend(
+        IncentiveChange(REMOVED, incentive_id, incentive)
+        for incentive_id, incentive in old.items()
+        if incentive_id not in new
+    )
+    return changes
+
+
+def by_id(incentives: Iterable[Incentive]) -> dict[int, Incentive]:
+    return {incentive.incentive_id: incentive for incentive in incentives}
+
+
+@dataclass(frozen=True)
+class RunChange:
+    kind: str
+    run: Run
+    previous: Run | None = None
+
+
+def diff_schedule(old: Sequence[Run], new: Sequence[Run]) -> tuple[list[Run], list[RunChange]]:
+    """Match `new` runs to `old` ones, reusing the old object for each untouched run.
+
+    Runs are matched by fingerprint first, so a run that moves keeps its match.
+    Those left over are matched by id, as edits. Neither list's runs are modified.
+    """
+    by_fingerprint: dict[int, deque[Run]] = defaultdict(deque)
+    for run in old:
+        by_fingerprint[run.fingerprint].append(run)
+
+    runs: list[Run | None] = []
+    changes: list[RunChange] = []
+    unmatched: list[int] = []
+    for run in new:
+        candidates = by_fingerprint.get(run.fingerprint)
+        if not candidates:
+            runs.append(None)
+            unmatched.append(len(runs) - 1)
+            continue
+
+        previous = candidates.popleft()
+        if (previous.start_t, previous.estimate) != (run.start_t, run.estimate):
+            runs.append(run)
+            changes.append(RunChange(RETIMED, run, previous))
+        elif (previous.run_id, previous.incentives) == (run.run_id, run.incentives):
+            runs.append(previous)
+        else:
+            # Moved, or its incentives changed, which diff_incentives reports.
+            runs.append(run)
+
+    leftover = {run.run_id: run for candidates in by_fingerprint.values() for run in candidates}
+    for index in unmatched:
+        run = new[index]
+        runs[index] = run
+        edited = leftover.pop(run.run_id) if run.run_id in leftover else None
+        changes.append(RunChange(EDITED if edited else ADDED, run, edited))
+
+    changes.extend(RunChange(REMOVED, run) for run in leftover.values())
+    return [run for run in runs if run is not None], changes
+
+
+def diff_schedule_files(old: ScheduleFile, new: ScheduleFile) -> list[RunChange]:
+    """Changes between two schedule files, building only the runs whose items differ."""
+    old_keys = [old.item_key(index) for index in range(len(old))]
+    new_keys = [new.item_key(index) for index in range(len(new))]
+
+    def unmatched(schedule: ScheduleFile, keys: list[tuple], others: list[tuple]) -> list[Run]:
+        counts = Counter(others)
+        runs = []
+        for index, key in enumerate(keys):
+            if counts[key]:
+                counts[key] -= 1
+            else:
+                runs.append(schedule[index])
+        return runs
+
+    _, changes = diff_schedule(unmatched(old, old_keys, new_keys), unmatched(new, new_keys, old_keys))
+    return changes
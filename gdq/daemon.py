@@ -0,0 +1,225 @@
+"""
+One process fetches, many terminals draw.
+
+Clients connect to a Unix socket and send a JSON request line, repeating it
+whenever their terminal size changes:
+
+    {"width": 120, "height": 40, "args": ["-x"], "mode": "frame"}
+
+"frame" clients receive {"header": [...], "body": [...], "footer": [...]}
+lines, pre-rendered for their size. "snapshot" clients receive the NDJSON
+stream from `gdq.display.ndjson` instead.
+"""
+import argparse
+import io
+import itertools
+import json
+import math
+import select
+import shutil
+import socket
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from gdq import utils
+from gdq.display.ndjson import NDJSONWriter, dumps
+from gdq.display.raw import Display
+from gdq.events import Marathon
+from gdq.polling import Poller
+from gdq.runners.base import RunnerBase
+
+# How often clients are checked for new frames, in seconds
+TICK = 1.0
+# Terminal size assumed when a request leaves it out
+DEFAULT_SIZE = (80, 24)
+
+
+class FrameServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    marathon: Marathon
+    runner: RunnerBase
+    # Bumped after every refresh so cached frames are discarded
+    generation: int = 0
+
+    def __init__(self, path: str, marathon: Marathon, runner: RunnerBase):
+        Path(path).unlink(missing_ok=True)
+        super().__init__(path, FrameHandler)
+        self.marathon = marathon
+        self.runner = runner
+        # Held while the model is being rebuilt or read
+        self.model_lock = threading.RLock()
+        self._cache_lock = threading.Lock()
+        self._cache_key: tuple[int, Any] = (-1, None)
+        self._frames: dict[tuple[Any, ...], bytes] = {}
+        self._snapshots: dict[tuple[str, ...], dict[str, Any]] = {}
+        self._parsed_args: dict[tuple[str, ...], argparse.Namespace] = {}
+
+    def refresh(self) -> None:
+        with self.model_lock:
+            self.marathon.refresh_all()
+            self.generation += 1
+
+    def _current_cache(self) -> None:
+        # Frames depend on the model and on the clock, so keep only the current tick.
+        key = (self.generation, utils.now)
+        if key != self._cache_key:
+            self._cache_key = key
+            self._frames = {}
+            self._snapshots = {}
+
+    def parse_args(self, event_args: tuple[str, ...]) -> argparse.Namespace:
+        if event_args not in self._parsed_args:
+            # Bad arguments come from a client, so raise rather than exit.
+            parser = self.runner.get_parser(exit_on_error=False)
+            self._parsed_args[event_args] = parser.parse_args(list(event_args))
+        return self._parsed_args[event_args]
+
+    def frame(self, width: int, height: int, event_args: tuple[str, ...]) -> bytes:
+        with self._cache_lock:
+            self._current_cache()
+            key = (width, height, event_args)
+            if key not in self._frames:
+                args = self.parse_args(event_args)
+                with self.model_lock:
+                    header = list(self.marathon.header(width=width, args=args))
+                    footer = list(self.marathon.footer(width=width, args=args))
+                    body_height = max(height - len(header) - len(footer), 0)
+                    rendered = self.marathon.render(width=width, args=args, height=body_height)
+                    body = list(itertools.islice(rendered, body_height))
+                frame = {"header": header, "body": body, "footer": footer}
+                self._frames[key] = (dumps(frame) + "\n").encode()
+            return self._frames[key]
+
+    def snapshot(self, event_args: tuple[str, ...]) -> dict[str, Any]:
+        with self._cache_lock:
+            self._current_cache()
+            if event_args not in self._snapshots:
+                args = self.parse_args(event_args)
+                with self.model_lock:
+                    self._snapshots[event_args] = self.marathon.snapshot(args=args)
+            return self._snapshots[event_args]
+
+
+class FrameHandler(socketserver.StreamRequestHandler):
+    server: FrameServer
+
+    def read_request(self) -> dict[str, Any] | None:
+        """The next valid request, answering invalid ones with an error. None once the client is gone."""
+        while line := self.rfile.readline():
+            try:
+                return self.validate(json.loads(line))
+            except (TypeError, ValueError, argparse.ArgumentError) as exc:
+                self.send_error(str(exc))
+        return None
+
+    def validate(self, request: Any) -> dict[str, Any]:
+        if not isinstance(request, dict):
+            msg = "a request must be a JSON object"
+            raise TypeError(msg)
+        event_args = request.get("args", [])
+        if not isinstance(event_args, list) or not all(isinstance(arg, str) for arg in event_args):
+            msg = "args must be a list of strings"
+            raise TypeError(msg)
+        try:
+            self.server.parse_args(tuple(event_args))
+        except SystemExit:
+            # argparse still exits on unrecognised arguments.
+            msg = f"invalid args: {' '.join(event_args)}"
+            raise ValueError(msg) from None
+        return request
+
+    def send_error(self, message: str) -> None:
+        self.wfile.write((dumps({"error": message}) + "\n").encode())
+
+    @staticmethod
+    def frame_size(request: dict[str, Any]) -> tuple[int, int]:
+        try:
+            return int(request.get("width", DEFAULT_SIZE[0])), int(request.get("height", DEFAULT_SIZE[1]))
+        except (TypeError, ValueError):
+            return DEFAULT_SIZE
+
+    def handle(self) -> None:
+        last_frame = b""
+        writer = NDJSONWriter(io.TextIOWrapper(self.wfile, encoding="utf-8", write_through=True))
+
+        try:
+            request = self.read_request()
+            while request is not None:
+                event_args = tuple(request.get("args", []))
+                if request.get("mode") == "snapshot":
+                    writer.emit(self.server.snapshot(event_args))
+                else:
+                    frame = self.server.frame(*self.frame_size(request), event_args)
+                    if frame != last_frame:
+                        self.wfile.write(frame)
+                        last_frame = frame
+
+                ready, _, _ = select.select([self.connection], [], [], TICK)
+                if ready:
+                    request = self.read_request()
+                    last_frame = b""
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def serve(path: str, marathon: Marathon, runner: RunnerBase, base_args: argparse.Namespace) -> None:
+    utils.quiet = True
+    server = FrameServer(path, marathon, runner)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    poller = Poller.from_args(base_args)
+    try:
+        active = True
+        while active:
+            server.refresh()
+            for _ in range(math.ceil(poller.update(marathon))):
+                utils.update_now()
+                time.sleep(1)
+            active = bool(utils.now <= marathon.end)
+    finally:
+        server.shutdown()
+        Path(path).unlink(missing_ok=True)
+
+
+def attach(path: str, event_args: list[str], *, snapshots: bool = False) -> None:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(path)
+        reader = client.makefile("rb")
+
+        def send_request(width: int, height: int) -> None:
+            request = {"width": width, "height": height, "args": event_args}
+            if snapshots:
+                request["mode"] = "snapshot"
+            client.sendall((dumps(request) + "\n").encode())
+
+        size = shutil.get_terminal_size()
+        send_request(*size)
+        display = Display()
+
+        while True:
+            ready, _, _ = select.select([client], [], [], TICK)
+            if ready:
+                line = reader.readline()
+                if not line:
+                    break
+                if snapshots:
+                    sys.stdout.write(line.decode())
+                    sys.stdout.flush()
+                else:
+                    frame = json.loads(line)
+                    if "error" in frame:
+                        sys.exit(frame["error"])
+                    display.refresh_terminal()
+                    display.update_header(frame["header"])
+                    display.update_body(frame["body"])
+                    display.update_footer(frame["footer"])
+                    print(flush=True, end="")
+
+            if shutil.get_terminal_size() != size:
+                size = shutil.get_terminal_size()
+                send_request(*size)
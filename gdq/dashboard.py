@@ -0,0 +1,157 @@
+"""
+Several marathons in one process and on one screen.
+
+───────┤ agdq ├──────────────┤ bus ├───────
+header               header
+footer               footer
+───────┤ horaro ├─────────────────────────
+header
+footer
+"""
+import argparse
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+import requests
+
+from gdq import runners, utils
+from gdq.display.columns import pad
+from gdq.display.raw import Display
+from gdq.events import Marathon
+from gdq.polling import Poller
+
+# Narrowest a tile may be before tiles are stacked instead
+TILE_WIDTH = 60
+
+
+@dataclass
+class Panel:
+    name: str
+    marathon: Marathon
+    args: argparse.Namespace
+    # Monotonic time of the next scheduled refresh
+    next_refresh: float = 0
+    refreshing: Future | None = None
+    error: str = ""
+    ready: bool = False
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    # Chooses when to refresh next, instead of the dashboard's fixed interval
+    poller: Poller | None = None
+    _lines: list[str] = field(default_factory=list)
+
+    def refresh(self) -> None:
+        with self.lock:
+            try:
+                self.marathon.refresh_all()
+                self.error = ""
+                self.ready = True
+            except (requests.RequestException, IndexError, KeyError, ValueError) as exc:
+                self.error = str(exc)
+                return
+            if self.poller:
+                self.next_refresh = time.monotonic() + self.poller.update(self.marathon)
+
+    def summary(self, width: int) -> list[str]:
+        try:
+            lines = list(self.marathon.header(width=width, args=self.args))
+            if utils.now <= self.marathon.end:
+                lines.extend(self.marathon.footer(width=width, args=self.args))
+        except (IndexError, KeyError, ValueError) as exc:
+            # An empty or partial schedule has nothing to show yet.
+            return [str(exc)[:width]]
+        return lines
+
+    def render(self, width: int) -> list[str]:
+        # Keep showing the last frame while a refresh holds the model.
+        if not self.lock.acquire(blocking=False):
+            return self._lines
+        try:
+            lines = [f"┤ {self.name} ├".center(width, "─")]
+            if self.error:
+                lines.append(self.error[:width])
+            if self.ready:
+                lines.extend(self.summary(width))
+            elif not self.error:
+                lines.append("Loading…".center(width))
+            self._lines = lines
+        finally:
+            self.lock.release()
+        return self._lines
+
+
+class Dashboard:
+    panels: list[Panel]
+    interval: int
+
+    def __init__(self, panels: list[Panel], interval: int):
+        self.panels = panels
+        self.interval = interval
+        # One scheduler for every marathon, sharing the transport session and cache.
+        self.executor = ThreadPoolExecutor(max_workers=len(panels), thread_name_prefix="refresh")
+
+    def schedule(self) -> None:
+        now = time.monotonic()
+        for panel in self.panels:
+            if panel.next_refresh <= now and (panel.refreshing is None or panel.refreshing.done()):
+                panel.next_refresh = now + self.interval
+                panel.refreshing = self.executor.submit(panel.refresh)
+
+    def wait_ready(self) -> None:
+        for panel in self.panels:
+            if panel.refreshing:
+                panel.refreshing.result()
+
+    def render(self, width: int) -> list[str]:
+        columns = max(1, min(len(self.panels), width // TILE_WIDTH))
+        tile_width = width // columns
+
+        lines: list[str] = []
+        for row_start in range(0, len(self.panels), columns):
+            tiles = [panel.render(tile_width) for panel in self.panels[row_start:row_start + columns]]
+            height = max(len(tile) for tile in tiles)
+            lines.extend(
+                "".join(pad(tile[index] if index < len(tile) else "", tile_width) for tile in tiles)
+                for index in range(height)
+            )
+        return lines
+
+
+def get_panels(config: Mapping[str, Any], names: list[str]) -> list[Panel]:
+    panels = []
+    for name in names:
+        marathon_config = config.get(name)
+        if marathon_config is None:
+            msg = f"No marathon named {name} found"
+            raise KeyError(msg)
+
+        runner = runners.get_runner(marathon_config, marathon_config.get("args", []))
+        panels.append(Panel(name=name, marathon=runner.get_marathon(), args=runner.args))
+    return panels
+
+
+def run(config: Mapping[str, Any], base_args: argparse.Namespace) -> None:
+    utils.quiet = True
+    dashboard = Dashboard(get_panels(config, base_args.dashboard), base_args.interval)
+    for panel in dashboard.panels:
+        panel.poller = Poller.from_args(base_args)
+
+    dashboard.schedule()
+    if base_args.oneshot:
+        dashboard.wait_ready()
+
+    while True:
+        utils.update_now()
+        dashboard.schedule()
+
+        display = Display()
+        display.update_header(dashboard.render(display.term_w))
+        display.update_body([])
+        print(flush=True, end="")
+
+        if base_args.oneshot:
+            return
+        time.sleep(1)
@@ -0,0 +1,90 @@
+"""
+Side by side columns, each rendered and cached on its own.
+
+col1           col2    col3
+"""
+import itertools
+import re
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+
+
+def visible_len(line: str) -> int:
+    return len(ANSI_ESCAPE.sub("", line))
+
+
+def pad(line: str, width: int) -> str:
+    return line + " " * max(width - visible_len(line), 0)
+
+
+@dataclass
+class Column:
+    render: Callable[[int], Iterable[str]]
+    # The objects drawn from, compared by identity
+    sources: tuple[Any, ...]
+    # Anything else the lines depend on, compared by value
+    key: tuple[Any, ...] = ()
+    # Share of the width, relative to the other columns
+    weight: int = 1
+
+
+@dataclass
+class _Cached:
+    sources: tuple[Any, ...]
+    key: tuple[Any, ...]
+    width: int
+    # Lines were rendered for at most this many rows
+    height: int
+    lines: list[str]
+
+    def matches(self, column: Column, width: int) -> bool:
+        return (
+            width == self.width
+            and self.key == column.key
+            and len(self.sources) == len(column.sources)
+            and all(old is new for old, new in zip(self.sources, column.sources, strict=True))
+        )
+
+
+class ColumnLayout:
+    separator: str = " "
+
+    def __init__(self) -> None:
+        self._columns: list[_Cached | None] = []
+        self._lines: list[str] = []
+        # The height `_lines` was merged for
+        self._height = 0
+
+    def widths(self, columns: list[Column], width: int) -> list[int]:
+        width -= len(self.separator) * (len(columns) - 1)
+        total_weight = sum(column.weight for column in columns)
+        widths = [width * column.weight // total_weight for column in columns]
+        # Give what rounding left over to the first column.
+        widths[0] += width - sum(widths)
+        return widths
+
+    def render(self, columns: list[Column], width: int, height: int) -> list[str]:
+        """Lay `columns` out side by side, re-rendering only those that changed."""
+        if len(self._columns) != len(columns):
+            self._columns = [None] * len(columns)
+
+        changed = False
+        for index, (column, column_width) in enumerate(zip(columns, self.widths(columns, width), strict=True)):
+            cached = self._columns[index]
+            if cached is None or not cached.matches(column, column_width) or cached.height < height:
+                lines = list(itertools.islice(column.render(column_width), height))
+                self._columns[index] = _Cached(column.sources, column.key, column_width, height, lines)
+                changed = True
+
+        if changed or height != self._height:
+            rendered = [cached for cached in self._columns if cached]
+            blocks = [cached.lines[:height] for cached in rendered]
+            self._lines = [
+                self.separator.join(pad(line, cached.width) for line, cached in zip(row, rendered, strict=True))
+                for row in itertools.zip_longest(*blocks, fillvalue="")
+            ]
+            self._height = height
+        return self._lines
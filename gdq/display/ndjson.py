@@ -0,0 +1,77 @@
+"""
+Headless output: one compact JSON document per line, written only on change.
+
+{"type":"snapshot","seq":0,"data":{...}}
+{"type":"delta","seq":1,"changed":{...},"removed":[...]}
+"""
+import json
+import sys
+from collections.abc import Mapping
+from typing import IO, Any
+
+Snapshot = dict[str, Any]
+
+
+def diff(old: Mapping[str, Any], new: Mapping[str, Any]) -> tuple[Snapshot, list[str]]:
+    """Find the keys of `new` that differ from `old`, descending into nested mappings.
+
+    Removed keys are reported as dotted paths.
+    """
+    changed: Snapshot = {}
+    removed = [key for key in old if key not in new]
+    for key, value in new.items():
+        if key not in old:
+            changed[key] = value
+        elif isinstance(value, Mapping) and isinstance(old[key], Mapping):
+            sub_changed, sub_removed = diff(old[key], value)
+            if sub_changed:
+                changed[key] = sub_changed
+            removed.extend(f"{key}.{sub_key}" for sub_key in sub_removed)
+        elif value != old[key]:
+            changed[key] = value
+    return changed, removed
+
+
+def dumps(document: Any) -> str:
+    return json.dumps(document, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class NDJSONWriter:
+    stream: IO[str]
+    # Send a full snapshot at least this often so late readers can catch up.
+    full_every: int
+    _last: Snapshot | None = None
+    _seq: int = 0
+    _since_full: int = 0
+
+    def __init__(self, stream: IO[str], full_every: int = 100):
+        self.stream = stream
+        self.full_every = full_every
+
+    @classmethod
+    def open(cls, path: str) -> "NDJSONWriter":
+        if path == "-":
+            return cls(sys.stdout)
+        # Line buffered so FIFO readers see each snapshot as soon as it is written.
+        return cls(open(path, "a", buffering=1, encoding="utf-8"))  # noqa: SIM115
+
+    def emit(self, snapshot: Snapshot) -> bool:
+        if snapshot == self._last:
+            return False
+
+        full_line = dumps({"type": "snapshot", "seq": self._seq, "data": snapshot})
+        line = full_line
+        if self._last is not None and self._since_full < self.full_every:
+            changed, removed = diff(self._last, snapshot)
+            delta: Snapshot = {"type": "delta", "seq": self._seq, "changed": changed}
+            if removed:
+                delta["removed"] = removed
+            line = min(line, dumps(delta), key=len)
+
+        self._since_full = 0 if line is full_line else self._since_full + 1
+
+        self.stream.write(line + "\n")
+        self.stream.flush()
+        self._last = snapshot
+        self._seq += 1
+        return True
@@ -0,0 +1,105 @@
+"""
+A window onto a body too long for the screen.
+
+Rows report their height without rendering, so the rows above the window are
+skipped by height alone and only the rows on screen are rendered. The window
+is moved with the keys below, or with SIGUSR1 and SIGUSR2 to page down and up.
+
+    j / k      one line down / up
+    space / b  one page down / up
+    g          back to the top
+"""
+import argparse
+import atexit
+import itertools
+import signal
+import sys
+import termios
+import threading
+import tty
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Protocol
+
+
+class Row(Protocol):
+    def height(self, width: int, args: argparse.Namespace) -> int:
+        ...
+
+    def render(self, width: int, args: argparse.Namespace) -> Iterable[str]:
+        ...
+
+
+class Viewport:
+    # Number of lines scrolled past
+    offset: int = 0
+    # Lines moved by a page, kept in step with the body's height on screen
+    page: int = 20
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+
+    def scroll(self, lines: int) -> None:
+        with self._lock:
+            self.offset = max(self.offset + lines, 0)
+
+    def top(self) -> None:
+        with self._lock:
+            self.offset = 0
+
+    def lines(self, rows: Sequence[Row], width: int, args: argparse.Namespace) -> Iterator[str]:
+        """Lines from `offset` on, rendering only rows that are reached."""
+        first, skip = self.find(rows, width, args)
+        for row in rows[first:first + 1]:
+            yield from itertools.islice(row.render(width, args), skip, None)
+        for row in rows[first + 1:]:
+            yield from row.render(width, args)
+
+    def find(self, rows: Sequence[Row], width: int, args: argparse.Namespace) -> tuple[int, int]:
+        """The row `offset` falls in and the lines of it above the window."""
+        while True:
+            skip = self.offset
+            total = 0
+            for index, row in enumerate(rows):
+                height = row.height(width, args)
+                if height > skip:
+                    return index, skip
+                skip -= height
+                total += height
+            if not self.offset:
+                return len(rows), 0
+            # Scrolled past the end, so come back to show the last page.
+            with self._lock:
+                self.offset = max(total - self.page, 0)
+
+    def handle_key(self, key: str) -> None:
+        if key == "j":
+            self.scroll(1)
+        elif key == "k":
+            self.scroll(-1)
+        elif key == " ":
+            self.scroll(self.page)
+        elif key == "b":
+            self.scroll(-self.page)
+        elif key == "g":
+            self.top()
+
+
+def listen(viewport: Viewport) -> None:
+    """Scroll `viewport` on key presses and on SIGUSR1/SIGUSR2."""
+    signal.signal(signal.SIGUSR1, lambda *_: viewport.scroll(viewport.page))
+    signal.signal(signal.SIGUSR2, lambda *_: viewport.scroll(-viewport.page))
+
+    if not sys.stdin.isatty():
+        return
+
+    # Read keys as they are pressed rather than a line at a time.
+    fd = sys.stdin.fileno()
+    settings = termios.tcgetattr(fd)
+    tty.setcbreak(fd)
+    atexit.register(termios.tcsetattr, fd, termios.TCSADRAIN, settings)
+
+    def read_keys() -> None:
+        while key := sys.stdin.read(1):
+            viewport.handle_key(key)
+
+    threading.Thread(target=read_keys, daemon=True, name="keys").start()
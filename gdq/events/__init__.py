@@ -1,12 +1,17 @@
 import argparse
 import math
 from abc import abstractmethod
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from datetime import datetime, timedelta
-from typing import Protocol
+from functools import partial
+from typing import Any, Protocol
 
-from gdq import utils
+from gdq import metrics, utils
+from gdq.changes import REMOVED, RunChange, diff_schedule, diff_schedule_files
+from gdq.display.columns import Column, ColumnLayout
+from gdq.display.viewport import Viewport
 from gdq.models import Run
+from gdq.parsers.schedule_file import ScheduleFile
 
 
 class Marathon(Protocol):
@@ -29,29 +34,139 @@ class Marathon(Protocol):
         ...
 
     @abstractmethod
-    def render(self, width: int, args: argparse.Namespace) -> Iterable[str]:
-        ...
+    def render(self, width: int, args: argparse.Namespace, height: int | None = None) -> Iterable[str]:
+        """The body, of which at most `height` lines will be shown if it is given."""
 
     @abstractmethod
     def footer(self, width: int, args: argparse.Namespace) -> Iterable[str]:
         ...
 
+    @abstractmethod
+    def snapshot(self, args: argparse.Namespace) -> dict[str, Any]:
+        ...
+
+    def changed(self) -> bool:
+        """Whether the last refresh found anything new."""
+        return True
+
+    def urgency(self) -> float | None:
+        """Seconds until something worth refreshing for, if anything is coming up."""
+        return None
+
 
 class TrackerBase(Marathon, Protocol):
     # Cached live data
-    schedules: list[list[Run]] = []
+    schedules: list[Sequence[Run]] = []
+    # How the last refresh changed the schedules
+    schedule_changes: list[RunChange] = []
+
+    # Number of upcoming runs to include in snapshots
+    upcoming_runs: int = 5
+    # The part of the schedule on screen
+    viewport: Viewport
+    # Columns of the split pane view
+    layout: ColumnLayout
+
+    def update_schedules(self, schedules: list[Sequence[Run]]) -> None:
+        """Replace the schedules, keeping the runs that didn't change.
+
+        Nothing is reported on the first refresh.
+        """
+        self.schedule_changes = []
+        if not self.schedules:
+            self.schedules = schedules
+            return
 
-    def render(self, width: int, args: argparse.Namespace) -> Iterable[str]:
+        for index, schedule in enumerate(schedules):
+            previous: Sequence[Run] = self.schedules[index] if index < len(self.schedules) else []
+            if schedule is previous:
+                continue
+            if isinstance(previous, ScheduleFile) and isinstance(schedule, ScheduleFile):
+                # Unchanged runs were reused while parsing, so there is nothing to swap in.
+                self.schedule_changes.extend(diff_schedule_files(previous, schedule))
+                continue
+            runs, changes = diff_schedule(previous, schedule)
+            if isinstance(schedule, list):
+                schedules[index] = runs
+            self.schedule_changes.extend(changes)
+        for previous in self.schedules[len(schedules):]:
+            self.schedule_changes.extend(RunChange(REMOVED, run) for run in previous)
+
+        for change in self.schedule_changes:
+            metrics.SCHEDULE_CHANGES.inc(kind=change.kind)
+        self.schedules = schedules
+
+    def changed(self) -> bool:
+        return bool(self.schedule_changes)
+
+    def live_runs(self) -> list[Run]:
+        if not self.schedules:
+            return []
+        return [run for run in self.schedules[0] if run.is_live]
+
+    def snapshot(self, args: argparse.Namespace) -> dict[str, Any]:
+        live = self.live_runs()
+        current = None
+        if live and live[0].start_t <= utils.now_timestamp():
+            current = live.pop(0)
+
+        return {
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "current": current.snapshot() if current else None,
+            "next": [run.snapshot() for run in live[:self.upcoming_runs]],
+        }
+
+    def render(self, width: int, args: argparse.Namespace, height: int | None = None) -> Iterable[str]:
+        if getattr(args, "split_pane", False):
+            return self.layout.render(self.columns(args), width, self.viewport.page if height is None else height)
+        return self.render_schedule(self.schedules[0], args, width)
+
+    def render_schedule(self, schedule: Sequence[Run], args: argparse.Namespace, width: int) -> Iterable[str]:
         first_line = True
+        for line in self.viewport.lines(schedule, width=width, args=args):
+            if first_line:
+                line = utils.flatten(line)
+                first_line = False
+            yield line
 
-        # TODO: Do this properly with columns
-        schedule = self.schedules[0]
+    def render_incentives(self, schedule: Sequence[Run], args: argparse.Namespace, width: int) -> Iterable[str]:
         for run in schedule:
-            for line in run.render(width=width, args=args):
-                if first_line:
-                    line = utils.flatten(line)
-                    first_line = False
-                yield line
+            if not (run.incentives and run.is_live):
+                continue
+            align_width = max(args.min_width, *(len(incentive) for incentive in run.incentives))
+            yield f"{run.delta}┬{'─' * (width - 9)}┐"
+            yield f"{' ' * 7}│{run.game_desc[:width - 9]:<{width - 9}}│"
+            for incentive in run.incentives:
+                yield from incentive.lines(width - 8, align_width, args)
+
+    def columns(self, args: argparse.Namespace) -> list[Column]:
+        """The schedule and its incentives, or each stream's schedule, side by side."""
+        # Times on screen change by the minute.
+        minute = utils.now_timestamp() // 60
+        offset = self.viewport.offset
+        if len(self.schedules) > 1:
+            return [
+                Column(partial(self.render_schedule, schedule, args), sources=(schedule, args), key=(minute, offset))
+                for schedule in self.schedules
+            ]
+
+        schedule = self.schedules[0]
+        if args.hide_incentives:
+            return [
+                Column(partial(self.render_schedule, schedule, args), sources=(schedule, args), key=(minute, offset)),
+            ]
+
+        schedule_args = argparse.Namespace(**{**vars(args), "hide_incentives": True})
+        return [
+            Column(
+                partial(self.render_schedule, schedule, schedule_args),
+                sources=(schedule, args),
+                key=(minute, offset),
+                weight=2,
+            ),
+            Column(partial(self.render_incentives, schedule, args), sources=(schedule, args), key=(minute,), weight=3),
+        ]
 
     def footer(self, width: int, args: argparse.Namespace) -> Iterable[str]:
         if args:
@@ -0,0 +1,48 @@
+import argparse
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any
+
+from bus.desert_bus import BusState, DesertBus
+from gdq import metrics, transport
+from gdq.events import Marathon
+from gdq.money import Dollar
+
+
+class BusTracker(Marathon):
+    bus: DesertBus
+    # The state the current screen is drawn from
+    _frame: BusState | None = None
+
+    def __init__(self, start: datetime):
+        self.bus = DesertBus(start=start)
+
+    def refresh_all(self) -> None:
+        state = transport.get_json("https://desertbus.org/wapi/init", "init")
+        self.bus.total = Dollar(state["total"])
+        metrics.TOTAL.set(self.bus.total.to_float(), event="bus")
+
+    @property
+    def start(self) -> datetime:
+        return self.bus.start
+
+    @property
+    def end(self) -> datetime:
+        return self.bus.end
+
+    def header(self, width: int, args: argparse.Namespace) -> Iterable[str]:
+        # Every screen is drawn header first, so the header picks the state for all three parts.
+        self._frame = self.bus.frame()
+        self.bus.width = width
+        yield from self.bus.header(self._frame, extended=args.extended_header)
+
+    def render(self, width: int, args: argparse.Namespace, height: int | None = None) -> Iterable[str]:
+        self.bus.width = width
+        yield from self.bus.render(self._frame or self.bus.frame())
+
+    def footer(self, width: int, args: argparse.Namespace) -> Iterable[str]:
+        self.bus.width = width
+        yield from self.bus.footer(self._frame or self.bus.frame(), overall=args.overall)
+
+    def snapshot(self, args: argparse.Namespace) -> dict[str, Any]:
+        return self.bus.snapshot()
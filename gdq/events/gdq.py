@@ -3,15 +3,22 @@ import operator
 from collections import namedtuple
 from collections.abc import Iterable
 from datetime import datetime, timedelta, timezone
-from typing import Union
+from typing import Any, Union
 
-from gdq import money, utils
+from gdq import changes, metrics, money, utils
+from gdq.display.columns import ColumnLayout
+from gdq.display.viewport import Viewport
 from gdq.events import TrackerBase
-from gdq.models import Event, MultiEvent, SingleEvent
+from gdq.models import ChoiceIncentive, Event, Incentive, MultiEvent, SingleEvent
 from gdq.parsers import gdq_api
 
 FakeRecord = namedtuple("FakeRecord", ["short_name", "total"])
 
+# Refreshes wanted before an open bid war's run starts
+BID_WAR_REFRESHES = 4
+# Refresh as often as allowed once the total is this close to the next record
+RECORD_MARGIN = 0.01
+
 
 class GDQTracker(TrackerBase):
     # Tracker base URL
@@ -38,6 +45,12 @@ class GDQTracker(TrackerBase):
         self.stream_name = stream_name
         self.offset = offset
         self.record_offsets = record_offsets
+        self.incentives: dict[int, Incentive] = {}
+        self._last_total: money.Money | None = None
+        self.total_changed = False
+        self.incentive_changes: list[changes.IncentiveChange] = []
+        self.viewport = Viewport()
+        self.layout = ColumnLayout()
 
     @property
     def start(self) -> datetime:
@@ -85,13 +98,69 @@ class GDQTracker(TrackerBase):
                 break
 
         self.records = sorted(events, key=operator.attrgetter("total"))
+        metrics.TOTAL.set(self.total.to_float(), event=self.current_event.short_name)
+        self.total_changed = self._last_total is not None and self.total != self._last_total
+        self._last_total = self.total
 
     def read_schedules(self) -> None:
-        self.schedules = []
-        for event in self.current_events:
-            self.schedules.append(
-                gdq_api.get_runs(self.url, event.event_id, self.currency)
-            )
+        # Nothing has changed on the first refresh, there is only something new to show.
+        first = not self.schedules
+        self.update_schedules([
+            gdq_api.get_runs(self.url, event.event_id, self.currency)
+            for event in self.current_events
+        ])
+
+        runs = [run for schedule in self.schedules for run in schedule]
+        incentives = changes.by_id(incentive for run in runs for incentive in run.incentives)
+        if first:
+            self.incentives = incentives
+            return
+
+        self.incentive_changes = changes.diff_incentives(self.incentives, incentives)
+        for change in self.incentive_changes:
+            metrics.INCENTIVE_CHANGES.inc(kind=change.kind)
+
+        # Keep unchanged incentives, and the lines already rendered for them.
+        changed = {change.incentive_id for change in self.incentive_changes}
+        for run in runs:
+            run.incentives = [
+                incentive if incentive.incentive_id in changed else self.incentives[incentive.incentive_id]
+                for incentive in run.incentives
+            ]
+        self.incentives = changes.by_id(incentive for run in runs for incentive in run.incentives)
+
+    def changed(self) -> bool:
+        return bool(self.schedule_changes or self.incentive_changes or self.total_changed)
+
+    def urgency(self) -> float | None:
+        deadlines = []
+        now = utils.now_timestamp()
+        for run in self.live_runs():
+            if run.start_t > now and any(
+                isinstance(incentive, ChoiceIncentive) and not incentive.closed for incentive in run.incentives
+            ):
+                deadlines.append((run.start_t - now) / BID_WAR_REFRESHES)
+                break
+
+        for record in self.records:
+            if record.total > self.total:
+                if (record.total - self.total).to_float() <= record.total.to_float() * RECORD_MARGIN:
+                    deadlines.append(0)
+                break
+
+        return min(deadlines, default=None)
+
+    def snapshot(self, args: argparse.Namespace) -> dict[str, Any]:
+        snapshot = super().snapshot(args)
+        snapshot["event"] = self.current_event.short_name
+        snapshot["total"] = self.total.to_float()
+        snapshot["incentives"] = {
+            str(incentive.incentive_id): incentive.snapshot()
+            for run in self.live_runs()
+            for incentive in run.incentives
+            if not (args.hide_completed and incentive.closed)
+        }
+        return snapshot
 
     def header(self, width: int, args: argparse.Namespace) -> Iterable[str]:
         if args.extended_header and self.current_event.charity:
@@ -2,6 +2,8 @@ import argparse
 from collections.abc import Iterable
 from datetime import datetime
 
+from gdq.display.columns import ColumnLayout
+from gdq.display.viewport import Viewport
 from gdq.events import TrackerBase
 from gdq.parsers import horaro
 
@@ -11,16 +13,34 @@ class HoraroTracker(TrackerBase):
     group_name: str = ""
     current_event: str
     key_map: dict[str, str]
-
-    def __init__(self, group: str, event: str, key_map: dict[str, str]):
+    # Seconds a fetched schedule is used without asking horaro.org again
+    max_age: float
+    # Follow the ticker, and only fetch the full schedule when it disagrees
+    ticker: bool
+
+    def __init__(
+        self, group: str, event: str, key_map: dict[str, str], max_age: float = horaro.MAX_AGE, ticker: bool = False
+    ):
         self.group_name = group
         self.current_event = event
         self.key_map = key_map
+        self.max_age = max_age
+        self.ticker = ticker
+        self.viewport = Viewport()
+        self.layout = ColumnLayout()
 
     def refresh_all(self) -> None:
-        self.schedules = [
-            horaro.read_schedule(self.group_name, self.current_event, self.key_map)
-        ]
+        max_age = self.max_age
+        if self.ticker and self.schedules:
+            if horaro.ticker_agrees(self.group_name, self.current_event, self.schedules[0]):
+                max_age = max(horaro.TICKER_MAX_AGE, max_age)
+            else:
+                max_age = 0
+
+        # Unchanged runs are already the same objects, so the schedule is kept as read.
+        self.update_schedules([
+            horaro.read_schedule(self.group_name, self.current_event, self.key_map, max_age)
+        ])
 
     @property
     def start(self) -> datetime:
@@ -0,0 +1,198 @@
+"""Process metrics, served in the Prometheus text format by `serve`."""
+import os
+import resource
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+Labels = tuple[tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _label_key(labels: dict[str, str]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels, **extra: str) -> str:
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ""
+    escaped = (f'{key}="{_escape(value)}"' for key, value in pairs)
+    return "{" + ",".join(escaped) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metric:
+    name: str
+    help_text: str
+    kind: str
+
+    def __init__(self, name: str, help_text: str, registry: list["Metric"] | None = None):
+        self.name = name
+        self.help_text = help_text
+        self._lock = threading.Lock()
+        (REGISTRY if registry is None else registry).append(self)
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def expose(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} {self.kind}"
+        yield from self.samples()
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, registry: list[Metric] | None = None):
+        super().__init__(name, help_text, registry)
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_format_labels(labels)} {value}"
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, registry: list[Metric] | None = None):
+        super().__init__(name, help_text, registry)
+        self._values: dict[Labels, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_format_labels(labels)} {value}"
+
+
+class Histogram(Metric):
+    kind = "histogram"
+    buckets: tuple[float, ...]
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+        registry: list[Metric] | None = None,
+    ):
+        super().__init__(name, help_text, registry)
+        self.buckets = buckets
+        # Per label set: a count for each bucket, then the running sum and count.
+        self._values: dict[Labels, tuple[list[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            counts, total, count = self._values.get(key, ([0] * len(self.buckets), 0.0, 0))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            self._values[key] = (counts, total + value, count + 1)
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = [(labels, (list(counts), total, count)) for labels, (counts, total, count) in self._values.items()]
+        for labels, (counts, total, count) in values:
+            for bound, bucket_count in zip(self.buckets, counts, strict=True):
+                yield f"{self.name}_bucket{_format_labels(labels, le=str(bound))} {bucket_count}"
+            yield f"{self.name}_bucket{_format_labels(labels, le='+Inf')} {count}"
+            yield f"{self.name}_sum{_format_labels(labels)} {total}"
+            yield f"{self.name}_count{_format_labels(labels)} {count}"
+
+
+class MemoryGauge(Metric):
+    kind = "gauge"
+
+    def samples(self) -> Iterable[str]:
+        yield f"{self.name} {resident_memory()}"
+
+
+REGISTRY: list[Metric] = []
+
+TOTAL = Gauge("gdq_total", "Current donation total of the followed event")
+FETCH_SECONDS = Histogram("gdq_fetch_seconds", "Time spent fetching remote resources")
+WIRE_BYTES = Counter("gdq_transfer_wire_bytes_total", "Response body bytes received, still content encoded")
+DECODED_BYTES = Counter("gdq_transfer_decoded_bytes_total", "Response body bytes after decoding")
+CACHE_REQUESTS = Counter("gdq_cache_requests_total", "Cache lookups by result")
+FRAME_SECONDS = Histogram(
+    "gdq_frame_seconds",
+    "Time spent drawing a single frame",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+)
+PUBNUB_MESSAGES = Counter("gdq_pubnub_messages_total", "Messages received from PubNub")
+BUS_POLLS = Counter("gdq_bus_polls_total", "Fallback polls of the Desert Bus total by result")
+INCENTIVE_CHANGES = Counter("gdq_incentive_changes_total", "Incentive changes seen between refreshes by kind")
+SCHEDULE_CHANGES = Counter("gdq_schedule_changes_total", "Runs added, removed, retimed or edited by kind")
+MEMORY = MemoryGauge("process_resident_memory_bytes", "Resident memory size in bytes")
+
+
+def resident_memory() -> int:
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # ru_maxrss is the peak, not the current size, but it's the best we have off Linux.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def render() -> str:
+    lines: list[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.expose())
+    return "\n".join(lines) + "\n"
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+
+        body = render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        # Requests would otherwise be logged over the display.
+        pass
+
+
+def serve(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
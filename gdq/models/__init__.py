@@ -1,11 +1,12 @@
 import argparse
 from abc import ABC, abstractmethod
 from collections.abc import Iterable
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone, tzinfo
+from functools import cached_property
 from operator import attrgetter
 from textwrap import wrap
-from typing import Union
+from typing import Any, Union
 
 from gdq import money, utils
 
@@ -51,6 +52,8 @@ class Incentive(ABC):
     short_desc: str
     current: money.Money
     state: str
+    # Rendered lines by layout, kept for as long as this incentive is unchanged
+    _lines: dict[tuple, list[str]] = field(default_factory=dict, init=False, compare=False, repr=False)
 
     @property
     def closed(self) -> bool:
@@ -64,6 +67,22 @@ class Incentive(ABC):
     def render(self, width: int, align: int, args: argparse.Namespace) -> list[str]:
         raise NotImplementedError
 
+    def lines(self, width: int, align: int, args: argparse.Namespace) -> list[str]:
+        """`render`, cached."""
+        key = (width, align, *vars(args).items())
+        if key not in self._lines:
+            self._lines[key] = self.render(width, align, args)
+        return self._lines[key]
+
+    @abstractmethod
+    def height(self, width: int, align: int, args: argparse.Namespace) -> int:
+        """The number of lines `render` would return."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def snapshot(self) -> dict[str, Any]:
+        raise NotImplementedError
+
     @abstractmethod
     def __len__(self) -> int:
         raise NotImplementedError
@@ -133,10 +152,12 @@ class Run:
     runners: list[Union[Runner, str]]
     incentives: list[Incentive]
 
-    start: datetime
+    # Epoch seconds, turned into a datetime in `timezone` only for display
+    start_t: int
     estimate: int
 
     run_id: int
+    timezone: tzinfo = timezone.utc
 
     @property
     def runner_str(self) -> str:
@@ -144,39 +165,74 @@ class Run:
 
     @property
     def delta(self) -> str:
-        if self.start < utils.now:
+        now = utils.now_timestamp()
+        if self.start_t < now:
             return "  NOW  "
-        delta = self.start - utils.now
-        if delta.days >= 10:
-            return f"{delta.days} DAYS"
-        hours, minutes = divmod(delta.seconds // 60, 60)
-        return f"{delta.days}:{hours:02d}:{minutes:02d}"
+        days, seconds = divmod(self.start_t - now, 86400)
+        if days >= 10:
+            return f"{days} DAYS"
+        hours, minutes = divmod(seconds // 60, 60)
+        return f"{days}:{hours:02d}:{minutes:02d}"
+
+    @cached_property
+    def fingerprint(self) -> int:
+        """Identifies what is being run, whenever it is scheduled."""
+        return hash((self.game, self.platform, self.category, self.runner_str))
+
+    @cached_property
+    def start(self) -> datetime:
+        return datetime.fromtimestamp(self.start_t, self.timezone)
+
+    @property
+    def end_t(self) -> int:
+        return self.start_t + self.estimate
 
     @property
     def end(self) -> datetime:
-        return self.start + timedelta(seconds=self.estimate)
+        return datetime.fromtimestamp(self.end_t, self.timezone)
+
+    @property
+    def remaining_t(self) -> int:
+        now = utils.now_timestamp()
+        if self.start_t < now:
+            return self.end_t - now
+        return self.estimate
 
     @property
     def remaining(self) -> timedelta:
-        if self.start < utils.now:
-            return self.end - utils.now
-        return timedelta(seconds=self.estimate)
+        return timedelta(seconds=self.remaining_t)
 
     @property
     def is_live(self) -> bool:
-        return self.remaining > timedelta()
+        if self.start_t < utils.now_timestamp():
+            return self.end_t > utils.now_timestamp()
+        return self.estimate > 0
 
     @property
     def str_estimate(self) -> str:
-        hours, minutes = divmod(self.remaining.seconds, 3600)
+        hours, minutes = divmod(self.remaining_t % 86400, 3600)
         minutes //= 60
         return f"+{hours}:{minutes:02d}"
 
     @property
     def game_desc(self) -> str:
+        return self._game_desc(self.game)
+
+    def _game_desc(self, game: str) -> str:
         if self.platform:
-            return f"{self.game.strip()} ({self.platform.strip()})"
-        return self.game
+            return f"{game.strip()} ({self.platform.strip()})"
+        return game
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "run_id": self.run_id,
+            "game": self.game,
+            "platform": self.platform,
+            "category": self.category,
+            "runners": [str(runner) for runner in self.runners],
+            "start": self.start.isoformat(),
+            "estimate": self.estimate,
+        }
 
     def render(self, width: int, args: argparse.Namespace) -> Iterable[str]:
         # If the run is over, skip it
@@ -184,16 +240,18 @@ class Run:
             return
 
         width -= 8
+        # Truncated copies, so that the run itself is left as parsed
+        game, category = self.game, self.category
         if not any(self.runners):
             desc_width = max(len(self.game_desc), len(self.category))
             if desc_width > width:
                 # If display too long, truncate run
-                self.game = self.game[:width - 1] + "…"
-                self.category = self.category[:width - 1] + "…"
+                game = game[:width - 1] + "…"
+                category = category[:width - 1] + "…"
 
             yield "{0}┼{1}┤".format("─" * 7, "─" * (width - 1))
-            yield f"{self.delta}│{self.game_desc:<{width - 1}s}│"
-            yield f"{self.str_estimate: >7s}│{self.category:<{width - 1}}│"
+            yield f"{self.delta}│{self._game_desc(game):<{width - 1}s}│"
+            yield f"{self.str_estimate: >7s}│{category:<{width - 1}}│"
 
         else:
             desc_width = max(width - 2 - len(self.runner_str), len(self.game_desc), len(self.category))
@@ -208,18 +266,29 @@ class Run:
                 # If display still too long, truncate run
                 overrun = desc_width + len(runner) - width
                 desc_width -= overrun
-                self.game = self.game[: -(overrun + 1)] + "…"
+                game = game[: -(overrun + 1)] + "…"
 
             border = "─" * (len(runner) - 2)
             yield f"───────┼{'─' * desc_width}┬{border}┤"
-            yield f"{self.delta}│{self.game_desc:<{desc_width}s}{runner}"
-            yield f"{self.str_estimate: >7s}│{self.category:<{desc_width}}└{border}┤"
+            yield f"{self.delta}│{self._game_desc(game):<{desc_width}s}{runner}"
+            yield f"{self.str_estimate: >7s}│{category:<{desc_width}}└{border}┤"
 
         # Handle incentives
         if self.incentives and not args.hide_incentives:
             align_width = max(args.min_width, *(len(incentive) for incentive in self.incentives))
             for incentive in self.incentives:
-                yield from incentive.render(width, align_width, args)
+                yield from incentive.lines(width, align_width, args)
+
+    def height(self, width: int, args: argparse.Namespace) -> int:
+        """The number of lines `render` would yield, without rendering them."""
+        if not self.is_live:
+            return 0
+
+        height = 3
+        if self.incentives and not args.hide_incentives:
+            align_width = max(args.min_width, *(len(incentive) for incentive in self.incentives))
+            height += sum(incentive.height(width - 8, align_width, args) for incentive in self.incentives)
+        return height
 
 
 @dataclass
@@ -237,6 +306,44 @@ class ChoiceIncentive(Incentive):
             return max(*(len(option.name) for option in self.options))
         return 0
 
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "name": self.short_desc,
+            "state": self.state,
+            "current": self.current.to_float(),
+            "options": {option.name: option.total.to_float() for option in self.options},
+        }
+
+    def shown_options(self, args: argparse.Namespace) -> tuple[list["Choice"], list["Choice"]]:
+        """Options drawn in full, and the rest that are summed up on one line."""
+        sorted_options = sorted(self.options, key=attrgetter("total"), reverse=True)
+        for index, option in enumerate(sorted_options):
+            try:
+                percent = option.total / self.current * 100
+            except ZeroDivisionError:
+                percent = 0
+
+            if percent < args.min_percent and index >= args.min_options and index != len(self.options) - 1:
+                return sorted_options[:index], sorted_options[index:]
+            if self.closed:
+                return sorted_options[:index + 1], []
+        return sorted_options, []
+
+    def height(self, width: int, align: int, args: argparse.Namespace) -> int:
+        if args.hide_completed and self.closed:
+            return 0
+
+        width -= 4
+        desc_size = max(align, len(self.short_desc))
+        height = max(len(wrap(self.description, width - desc_size - 1)), 1)
+
+        shown, rest = self.shown_options(args)
+        for option in shown:
+            height += 1
+            if option.description and option.description != option.name:
+                height += len(wrap(option.description, width - 1))
+        return height + bool(rest)
+
     def render(self, width: int, align: int, args: argparse.Namespace) -> list[str]:
         incentive = []
 
@@ -255,22 +362,8 @@ class ChoiceIncentive(Incentive):
             else:
                 incentive.append(f"       ├┬{self.short_desc:<{desc_size}s}  {'': <{rest_size}s}│")
 
-            sorted_options = sorted(self.options, key=attrgetter("total"), reverse=True)
-            for index, option in enumerate(sorted_options):
-                try:
-                    percent = option.total / self.current * 100
-                except ZeroDivisionError:
-                    percent = 0
-
-                if percent < args.min_percent and index >= args.min_options and index != len(self.options) - 1:
-                    remaining = sorted_options[index:]
-                    option_totals = [option.total for option in remaining]
-                    total = sum(option_totals, self.currency())
-                    description = f"And {len(remaining)} more"
-                    prog_bar = utils.progress_bar(0, total.to_float(), self.max_option.to_float(), width - align - 7)
-                    incentive.append(f"       │╵ {description:<{align}s}▕{prog_bar}▏{total.short: >6s}│")
-                    break
-
+            shown, remaining = self.shown_options(args)
+            for index, option in enumerate(shown):
                 prog_bar = utils.progress_bar(0, option.total.to_float(), self.max_option.to_float(), width - align - 7)
 
                 leg = "├│"
@@ -284,8 +377,11 @@ class ChoiceIncentive(Incentive):
                     for line in lines[1:]:
                         incentive.append(f"       │{leg[1]}   {line.ljust(width - 1)}│")
 
-                if self.closed:
-                    break
+            if remaining:
+                total = sum((option.total for option in remaining), self.currency())
+                description = f"And {len(remaining)} more"
+                prog_bar = utils.progress_bar(0, total.to_float(), self.max_option.to_float(), width - align - 7)
+                incentive.append(f"       │╵ {description:<{align}s}▕{prog_bar}▏{total.short: >6s}│")
 
         return incentive
 
@@ -304,6 +400,19 @@ class DonationIncentive(Incentive):
     def __len__(self) -> int:
         return len(self.short_desc)
 
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "name": self.short_desc,
+            "state": self.state,
+            "current": self.current.to_float(),
+            "goal": self.total.to_float(),
+        }
+
+    def height(self, width: int, align: int, args: argparse.Namespace) -> int:
+        if args.hide_completed and self.closed:
+            return 0
+        return len(wrap(self.description, width - 3)) + 1
+
     def render(self, width: int, align: int, args: argparse.Namespace) -> list[str]:
         incentive = []
 
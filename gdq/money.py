@@ -61,6 +61,9 @@ class Money(ABC):
     def __bool__(self) -> bool:
         return bool(self._value)
 
+    def __hash__(self) -> int:
+        return hash((type(self), self._value))
+
     def __len__(self) -> int:
         return len(str(self))
 
@@ -127,6 +130,11 @@ class Money(ABC):
     def to_float(self) -> float:
         return float(self._value / (10 ** self._exponent))
 
+    @property
+    def minor_units(self) -> int:
+        """The value in the currency's smallest unit, e.g. cents."""
+        return self._value
+
     @property
     def short(self) -> str:
         return f"{self.symbol}{utils.short_number(self.to_float())}"
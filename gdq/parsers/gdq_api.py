@@ -4,17 +4,20 @@ import re
 import urllib.parse
 from collections import defaultdict
 from datetime import datetime, timezone
+from typing import Any
 
-import requests
-
-from gdq import money
+from gdq import money, transport
 from gdq.models import (Choice, ChoiceIncentive, DonationIncentive, Event,
                         Incentive, MultiEvent, Run, Runner, SingleEvent)
 
 
-def _get_resource(base_url: str, resource_type: str, **kwargs: str) -> requests.Response:
+# Identical searches within this many seconds share one response
+MAX_AGE = 10
+
+
+def _get_resource(base_url: str, resource_type: str, **kwargs: str) -> Any:
     resource_url = urllib.parse.urljoin(base_url, "api/v1/search")
-    return requests.get(resource_url, params={"type": resource_type, **kwargs})
+    return transport.get_json(resource_url, resource_type, params={"type": resource_type, **kwargs}, max_age=MAX_AGE)
 
 
 def get_events(base_url: str, event_name: str = "") -> list[Event]:
@@ -23,7 +26,7 @@ def get_events(base_url: str, event_name: str = "") -> list[Event]:
         kwargs["short"] = str(event_name)
 
     try:
-        events = _get_resource(base_url, "event", **kwargs).json()
+        events = _get_resource(base_url, "event", **kwargs)
     except json.decoder.JSONDecodeError:
         return []
 
@@ -85,7 +88,7 @@ def get_events(base_url: str, event_name: str = "") -> list[Event]:
 
 
 def get_runs(base_url: str, event_id: int, currency: type[money.Money]) -> list[Run]:
-    runs = _get_resource(base_url, "run", event=str(event_id)).json()
+    runs = _get_resource(base_url, "run", event=str(event_id))
     run_list = []
 
     runners = get_runners_for_event(base_url, event_id)
@@ -111,7 +114,8 @@ def get_runs(base_url: str, event_id: int, currency: type[money.Money]) -> list[
                 incentives.get(run["name"]) or [],
                 key=operator.attrgetter("incentive_id"),
             ),
-            start=start_time,
+            start_t=int(start_time.timestamp()),
+            timezone=start_time.tzinfo or timezone.utc,
             estimate=int(estimate),
         ))
 
@@ -119,7 +123,7 @@ def get_runs(base_url: str, event_id: int, currency: type[money.Money]) -> list[
 
 
 def get_runners_for_event(base_url: str, event_id: int) -> dict[int, Runner]:
-    runners = _get_resource(base_url, resource_type="runner", event=str(event_id)).json()
+    runners = _get_resource(base_url, resource_type="runner", event=str(event_id))
     runner_dict = {}
 
     for runner in runners:
@@ -134,7 +138,7 @@ def get_incentives_for_event(
         base_url: str, event_id: int,
         currency: type[money.Money]) -> dict[str, list[Incentive]]:
     # FIXME: This stops at 500 results, and doesn't seem to be pageable.
-    incentives = _get_resource(base_url, "allbids", event=str(event_id)).json()
+    incentives = _get_resource(base_url, "allbids", event=str(event_id))
     incentive_dict: dict[str, list[Incentive]] = dict()
     choices = defaultdict(list)
 
@@ -1,58 +1,119 @@
-import shelve
+import bisect
+import dataclasses
+import os
+import time
+from collections.abc import Sequence
 from datetime import datetime
 from pathlib import Path
 
-import requests
 import xdg
 from zoneinfo import ZoneInfo
 
+from gdq import cache, metrics, transport
 from gdq.models import Run
+from gdq.parsers import schedule_file
 
+# A schedule fetched by any process less than this many seconds ago is reused as is.
+MAX_AGE = 10
+# How long a schedule is trusted in ticker mode while the ticker agrees with it
+TICKER_MAX_AGE = 15 * 60
 
-def read_schedule(event: str, stream_id: str, key_map: dict[str, str]) -> list[Run]:
-    shelve_file = Path(xdg.XDG_CACHE_HOME) / "gdq" / f"{event}-{stream_id}.db"
-    if not shelve_file.exists():
-        shelve_file.parent.mkdir(parents=True, exist_ok=True)
-        last_check = None
-        runs = []
-    else:
-        with shelve.open(str(shelve_file)) as shelf:
-            last_check = shelf.get('updated')
-            runs = shelf.get('runs', [])
-
-    headers = {}
-    if last_check:
-        headers['If-Modified-Since'] = datetime.strftime(last_check, '%a, %d %b %Y %H:%M:%S GMT')
-    data = requests.get(
-        f'https://horaro.org/-/api/v1/events/{event}/schedules/{stream_id}', headers=headers
-    )
 
+def read_schedule(event: str, stream_id: str, key_map: dict[str, str], max_age: float = MAX_AGE) -> Sequence[Run]:
+    path = Path(xdg.XDG_CACHE_HOME) / "gdq" / "horaro" / f"{event}-{stream_id}.schedule"
+    with cache.shared().lock(f"horaro:{event}/{stream_id}"):
+        cached = schedule_file.load(path)
+        runs: Sequence[Run] = cached[0] if cached else []
+        if cached and time.time() - cached[1].st_mtime < max_age:
+            metrics.CACHE_REQUESTS.inc(cache="horaro", result="hit")
+            return runs
+
+        headers = {}
+        if cached and cached[0].validator:
+            headers['If-Modified-Since'] = cached[0].validator
+        data = transport.get(
+            f'https://horaro.org/-/api/v1/events/{event}/schedules/{stream_id}', "horaro", headers=headers
+        )
+
+        try:
+            data_dict = data.json()['data']
+        except ValueError:
+            metrics.CACHE_REQUESTS.inc(cache="horaro", result="hit")
+            if data.status_code == 304 and cached:
+                # The modification time records when the copy was last known to be fresh.
+                os.utime(path)
+            return runs
+        metrics.CACHE_REQUESTS.inc(cache="horaro", result="miss")
+
+        updated = datetime.strptime(data_dict['updated'], '%Y-%m-%dT%H:%M:%S%z')
+        previous = cached[0] if cached and cached[0].columns == list(key_map) else None
+        runs = parse_schedule(data_dict, key_map, previous)
+        schedule_file.write(
+            path,
+            runs,
+            columns=list(key_map),
+            timezone=data_dict['timezone'],
+            validator=datetime.strftime(updated, '%a, %d %b %Y %H:%M:%S GMT'),
+        )
+        written = schedule_file.load(path)
+        if written:
+            written[0].prime(runs)
+            runs = written[0]
+
+    return runs
+
+
+def ticker_agrees(event: str, stream_id: str, runs: Sequence[Run]) -> bool:
+    """Whether the current and next items reported by horaro.org are in `runs` as is."""
+    data = transport.get(f'https://horaro.org/-/api/v1/events/{event}/schedules/{stream_id}/ticker', "horaro-ticker")
     try:
-        data_dict = data.json()['data']
-    except ValueError:
-        return runs
+        ticker = data.json()['data']['ticker']
+    except (ValueError, KeyError):
+        return False
+
+    for item in (ticker.get('current'), ticker.get('next')):
+        if item is None:
+            continue
+        # Runs are in start order, so look the item up by its start time.
+        index = bisect.bisect_left(runs, item['scheduled_t'], key=lambda run: run.start_t)
+        if index == len(runs) or (runs[index].start_t, runs[index].estimate) != (item['scheduled_t'], item['length_t']):
+            return False
+    return True
+
 
-    updated = datetime.strptime(data_dict['updated'], '%Y-%m-%dT%H:%M:%S%z')
+def parse_schedule(
+    data_dict: dict, key_map: dict[str, str], previous: schedule_file.ScheduleFile | None = None
+) -> list[Run]:
+    """Build runs from a horaro schedule.
+
+    Runs in `previous` whose item is unchanged are reused rather than rebuilt.
+    A run whose item has moved is copied with its new id, as `previous` still
+    hands out the original.
+    """
     timezone = ZoneInfo(data_dict['timezone'])
     keys = data_dict['columns']
     schedule = data_dict['items']
 
     runs = []
-    attr_to_index = {
-        key: keys.index(value) for key, value in key_map.items()
-    }
+    indexes = [keys.index(value) for value in key_map.values()]
+    attr_to_index = dict(zip(key_map, indexes, strict=True))
     runners = attr_to_index.pop("runners", "")
+    reusable = {previous.item_key(index): index for index in range(len(previous))} if previous else {}
     for index, run in enumerate(schedule):
+        item_key = (run["scheduled_t"], run["length_t"], *(run["data"][column] for column in indexes))
+        if previous is not None and item_key in reusable:
+            reused = previous[reusable.pop(item_key)]
+            runs.append(reused if reused.run_id == index else dataclasses.replace(reused, run_id=index))
+            continue
+
         runs.append(Run(
             run_id=index,
             runners=[run["data"][runners]],
-            start=datetime.fromtimestamp(run["scheduled_t"]).astimezone(timezone),
+            start_t=run["scheduled_t"],
+            timezone=timezone,
             estimate=run["length_t"],
+            incentives=[],
             **{key: run["data"][value] for key, value in attr_to_index.items()},
         ))
 
-    with shelve.open(str(shelve_file)) as shelf:
-        shelf['updated'] = updated
-        shelf['runs'] = runs
-
     return runs
@@ -0,0 +1,200 @@
+"""
+A compact, memory-mapped schedule cache.
+
+    header    magic, version, column count, run count, string count, and the
+              string ids of the timezone and the HTTP validator
+    columns   start times and estimates as int64 seconds, then the string ids
+              of the column names, then one uint32 string id per run and column
+    strings   uint32 offsets into a UTF-8 blob, each distinct string stored once
+
+Values are in native byte order, as the file never leaves the host that
+wrote it. Runs are only built when they are first accessed.
+"""
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import Any, overload
+from zoneinfo import ZoneInfo
+
+from gdq.models import Run
+
+MAGIC = b"GDQS"
+VERSION = 1
+HEADER = struct.Struct("=4sHHIIII")
+# String id standing in for a missing value
+NULL = 0xFFFFFFFF
+
+
+class StringTable:
+    def __init__(self) -> None:
+        self.ids: dict[str, int] = {}
+
+    def intern(self, value: str | None) -> int:
+        if value is None:
+            return NULL
+        return self.ids.setdefault(value, len(self.ids))
+
+    def to_bytes(self) -> bytes:
+        blob = bytearray()
+        offsets = array("I", [0])
+        for value in self.ids:
+            blob += value.encode()
+            offsets.append(len(blob))
+        return offsets.tobytes() + blob
+
+
+def write(path: Path, runs: Sequence[Run], columns: Sequence[str], timezone: str, validator: str) -> None:
+    """Atomically replace `path` with `runs`, keeping the attributes named in `columns`."""
+    strings = StringTable()
+    timezone_id = strings.intern(timezone)
+    validator_id = strings.intern(validator)
+
+    starts = array("q", (run.start_t for run in runs))
+    estimates = array("q", (run.estimate for run in runs))
+    names = array("I", (strings.intern(column) for column in columns))
+    values = array("I")
+    for column in columns:
+        if column == "runners":
+            values.extend(strings.intern(str(run.runners[0]) if run.runners else None) for run in runs)
+        else:
+            values.extend(strings.intern(getattr(run, column)) for run in runs)
+
+    header = HEADER.pack(MAGIC, VERSION, len(columns), len(runs), len(strings.ids), timezone_id, validator_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with temp_path.open("wb") as schedule_file:
+        schedule_file.write(header)
+        for part in (starts, estimates, names, values):
+            schedule_file.write(part)
+        schedule_file.write(strings.to_bytes())
+    os.replace(temp_path, path)
+
+
+class ScheduleFile(Sequence[Run]):
+    path: Path
+    timezone: ZoneInfo
+    validator: str
+    columns: list[str]
+
+    def __init__(self, path: Path):
+        self.path = path
+        with path.open("rb") as schedule_file:
+            self._map = mmap.mmap(schedule_file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = self._view = memoryview(self._map)
+
+        magic, version, column_count, count, string_count, timezone_id, validator_id = HEADER.unpack_from(view)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} schedule file")
+
+        offset = HEADER.size
+        self._count = count
+
+        def column(format: str, length: int) -> memoryview:
+            nonlocal offset
+            size = length * struct.calcsize(format)
+            values = view[offset:offset + size].cast(format)
+            offset += size
+            return values
+
+        self._starts = column("q", count)
+        self._estimates = column("q", count)
+        name_ids = column("I", column_count)
+        self._values = column("I", count * column_count)
+        self._offsets = column("I", string_count + 1)
+        self._blob = view[offset:]
+        self._strings: dict[int, str] = {}
+        self._runs: dict[int, Run] = {}
+
+        self.columns = [self.string(name_id) for name_id in name_ids]
+        self.timezone = ZoneInfo(self.string(timezone_id))
+        self.validator = self.string(validator_id)
+
+    def string(self, string_id: int) -> Any:
+        if string_id == NULL:
+            return None
+        if string_id not in self._strings:
+            start, end = self._offsets[string_id], self._offsets[string_id + 1]
+            self._strings[string_id] = bytes(self._blob[start:end]).decode()
+        return self._strings[string_id]
+
+    def __len__(self) -> int:
+        return self._count
+
+    @overload
+    def __getitem__(self, index: int) -> Run: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Run]: ...
+
+    def __getitem__(self, index: int | slice) -> Run | list[Run]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        position = index + self._count if index < 0 else index
+        if not 0 <= position < self._count:
+            raise IndexError(index)
+        if position not in self._runs:
+            self._runs[position] = self._build(position)
+        return self._runs[position]
+
+    def __iter__(self) -> Iterator[Run]:
+        for index in range(self._count):
+            yield self[index]
+
+    def item_key(self, index: int) -> tuple:
+        """What the run at `index` was built from, without building it."""
+        return (
+            self._starts[index],
+            self._estimates[index],
+            *(self.string(self._values[position * self._count + index]) for position in range(len(self.columns))),
+        )
+
+    def close(self) -> None:
+        """Unmap the file. Runs already built stay usable, the rest can no longer be read."""
+        for view in (self._starts, self._estimates, self._values, self._offsets, self._blob, self._view):
+            view.release()
+        self._map.close()
+
+    def prime(self, runs: Sequence[Run]) -> None:
+        """Use already built `runs` instead of rebuilding them from the file."""
+        self._runs = dict(enumerate(runs))
+
+    def _build(self, index: int) -> Run:
+        attrs = {
+            column: self.string(self._values[position * self._count + index])
+            for position, column in enumerate(self.columns)
+        }
+        attrs.setdefault("incentives", [])
+        return Run(
+            run_id=index,
+            runners=[attrs.pop("runners", "")],
+            start_t=self._starts[index],
+            timezone=self.timezone,
+            estimate=self._estimates[index],
+            **attrs,
+        )
+
+
+# Open schedules by path, reused until the file is replaced. Replaced schedules
+# are left to be unmapped once nothing holds them any more.
+_open: dict[Path, tuple[tuple[int, int], ScheduleFile]] = {}
+
+
+def load(path: Path) -> tuple[ScheduleFile, os.stat_result] | None:
+    """The schedule at `path` and its stat, or None if there is no usable file."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+
+    identity = (stat.st_ino, stat.st_size)
+    if path in _open and _open[path][0] == identity:
+        return _open[path][1], stat
+    try:
+        schedule = ScheduleFile(path)
+    except (ValueError, struct.error):
+        return None
+    _open[path] = (identity, schedule)
+    return schedule, stat
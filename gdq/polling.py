@@ -0,0 +1,39 @@
+"""
+How long to wait before refreshing a marathon again.
+"""
+import argparse
+
+from gdq.events import Marathon
+
+
+class Poller:
+    """An interval between `minimum` and `maximum` seconds.
+
+    The interval doubles after each refresh that found nothing new and halves
+    after one that did. It is also cut short to whatever the marathon says is
+    coming up soon, like a bid war closing or a record about to fall.
+    """
+
+    minimum: float
+    maximum: float
+    interval: float
+
+    def __init__(self, minimum: float, maximum: float):
+        self.minimum = minimum
+        self.maximum = max(maximum, minimum)
+        self.interval = self.minimum
+
+    @classmethod
+    def from_args(cls, base_args: argparse.Namespace) -> "Poller":
+        return cls(base_args.min_interval or base_args.interval, base_args.max_interval or base_args.interval)
+
+    def update(self, marathon: Marathon) -> float:
+        if marathon.changed():
+            self.interval = max(self.interval / 2, self.minimum)
+        else:
+            self.interval = min(self.interval * 2, self.maximum)
+
+        urgency = marathon.urgency()
+        if urgency is not None:
+            self.interval = max(min(self.interval, urgency), self.minimum)
+        return self.interval
@@ -12,6 +12,14 @@ def get_base_parser() -> argparse.ArgumentParser:
         "-n", "--interval", type=int, default=60,
         help="time between screen refreshes",
     )
+    parser.add_argument(
+        "--min-interval", type=int,
+        help="Refresh as often as this when things change or are about to (default: --interval)",
+    )
+    parser.add_argument(
+        "--max-interval", type=int,
+        help="Back off to this while nothing changes (default: --interval)",
+    )
     parser.add_argument(
         "--oneshot", action="store_true",
         help="Run only once and then exit",
@@ -20,6 +28,30 @@ def get_base_parser() -> argparse.ArgumentParser:
         "--list", action="store_true",
         help="List all known events instead of tracking one",
     )
+    parser.add_argument(
+        "--dashboard", metavar="NAME", nargs="+", action="extend",
+        help="Show several configured marathons on one screen",
+    )
+    parser.add_argument(
+        "--ndjson", metavar="PATH",
+        help="Write JSON snapshots to PATH ('-' for stdout) instead of drawing",
+    )
+    parser.add_argument(
+        "--serve", metavar="SOCKET",
+        help="Fetch for many displays, serving frames on a Unix socket",
+    )
+    parser.add_argument(
+        "--attach", metavar="SOCKET",
+        help="Draw frames from a daemon started with --serve",
+    )
+    parser.add_argument(
+        "--metrics-port", type=int,
+        help="Serve Prometheus metrics on this local port",
+    )
+    parser.add_argument(
+        "--stats", action="store_true",
+        help="Print bytes fetched per resource, on the wire and decoded, on exit",
+    )
     parser.add_argument(
         "stream_name", nargs="?", type=str, default="gdq",
         help="The event to follow",
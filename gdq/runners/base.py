@@ -24,7 +24,8 @@ class RunnerBase(ABC):
 
         return (event.start, event.end)
 
-    def set_options(self, event_args: list[str]) -> None:
-        parser = argparse.ArgumentParser()
+    def get_parser(self, *, exit_on_error: bool = True) -> argparse.ArgumentParser:
+        return argparse.ArgumentParser(exit_on_error=exit_on_error)
 
-        self.args = parser.parse_args(event_args)
+    def set_options(self, event_args: list[str]) -> None:
+        self.args = self.get_parser().parse_args(event_args)
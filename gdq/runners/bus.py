@@ -0,0 +1,25 @@
+import argparse
+
+from gdq.events.bus import BusTracker
+from gdq.runners.base import RunnerBase
+
+
+class Runner(RunnerBase):
+    def get_marathon(self) -> BusTracker:
+        if "start" not in self.event_config:
+            raise KeyError("`start` key missing from configuration")
+
+        return BusTracker(start=self.event_config["start"])
+
+    def get_parser(self, *, exit_on_error: bool = True) -> argparse.ArgumentParser:
+        parser = argparse.ArgumentParser(exit_on_error=exit_on_error)
+        parser.add_argument(
+            "-x", "--extended-header", action="store_true",
+            help="Show estimate and lifetime totals in the header",
+        )
+        parser.add_argument(
+            "--overall", action="store_true",
+            help="Scale the progress bar to the whole run instead of the last record",
+        )
+
+        return parser
@@ -20,8 +20,8 @@ class Runner(RunnerBase):
             record_offsets=record_offsets,
         )
 
-    def set_options(self, event_args: list[str]) -> None:
-        parser = argparse.ArgumentParser()
+    def get_parser(self, *, exit_on_error: bool = True) -> argparse.ArgumentParser:
+        parser = argparse.ArgumentParser(exit_on_error=exit_on_error)
         parser.add_argument(
             "-d", "--delta-total", type=float, default=0,
             help="Offset to subtract from event total to reconcile discrepencies",
@@ -67,4 +67,4 @@ class Runner(RunnerBase):
             help="Show known marathons and status",
         )
 
-        self.args = parser.parse_args(event_args)
+        return parser
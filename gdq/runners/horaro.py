@@ -1,6 +1,7 @@
 import argparse
 
 from gdq.events.horaro import HoraroTracker
+from gdq.parsers import horaro
 from gdq.runners.base import RunnerBase
 
 
@@ -11,15 +12,21 @@ class Runner(RunnerBase):
                 group=self.event_config["group"],
                 event=self.event_config["event"],
                 key_map=self.event_config["keys"],
+                max_age=self.event_config.get("max_age", horaro.MAX_AGE),
+                ticker=self.args.ticker,
             )
         except KeyError as exc:
             raise KeyError(f"`{exc!s}` key missing from configuration")
 
-    def set_options(self, event_args: list[str]) -> None:
-        parser = argparse.ArgumentParser()
+    def get_parser(self, *, exit_on_error: bool = True) -> argparse.ArgumentParser:
+        parser = argparse.ArgumentParser(exit_on_error=exit_on_error)
         parser.add_argument(
             "-i", "--stream_index", type=int, default=1,
             help="Follow only a single stream",
         )
+        parser.add_argument(
+            "-t", "--ticker", action="store_true",
+            help="Poll only the current and next runs, fetching the full schedule rarely",
+        )
 
-        self.args = parser.parse_args(event_args)
+        return parser
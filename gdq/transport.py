@@ -0,0 +1,109 @@
+"""Shared HTTP session and response cache for everything that fetches."""
+import json
+import threading
+import urllib.parse
+from dataclasses import dataclass, replace
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+from gdq import cache, metrics
+
+TIMEOUT = 30
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+# Decoded copies of shared cache entries, keyed by cache key and fetch time
+_decoded: dict[str, tuple[float, Any]] = {}
+_decoded_lock = threading.Lock()
+
+
+@dataclass
+class Transfer:
+    requests: int = 0
+    # Body bytes as received, before any content encoding is undone
+    wire: int = 0
+    decoded: int = 0
+
+    @property
+    def saved(self) -> float:
+        """Share of the decoded size that compression kept off the wire."""
+        if not self.decoded:
+            return 0.0
+        return 1 - self.wire / self.decoded
+
+
+_transfers: dict[str, Transfer] = {}
+_transfers_lock = threading.Lock()
+
+
+def session() -> requests.Session:
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            # Every encoding urllib3 can decode here: gzip and deflate, plus br and zstd if installed
+            _session.headers["Accept-Encoding"] = make_headers(accept_encoding=True)["accept-encoding"]
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+def get(url: str, resource: str, **kwargs: Any) -> requests.Response:
+    kwargs.setdefault("timeout", TIMEOUT)
+    with metrics.FETCH_SECONDS.time(resource=resource):
+        response = session().get(url, stream=True, **kwargs)
+        # The body is decompressed a chunk at a time as it is read.
+        decoded = len(response.content)
+    record(resource, response.raw.tell(), decoded)
+    return response
+
+
+def record(resource: str, wire: int, decoded: int) -> None:
+    metrics.WIRE_BYTES.inc(wire, resource=resource)
+    metrics.DECODED_BYTES.inc(decoded, resource=resource)
+    with _transfers_lock:
+        transfer = _transfers.setdefault(resource, Transfer())
+        transfer.requests += 1
+        transfer.wire += wire
+        transfer.decoded += decoded
+
+
+def transfers() -> dict[str, Transfer]:
+    """Bytes fetched so far, by resource."""
+    with _transfers_lock:
+        return {resource: replace(transfer) for resource, transfer in _transfers.items()}
+
+
+def get_json(url: str, resource: str, params: dict[str, str] | None = None, max_age: float = 0) -> Any:
+    """Fetch and decode a JSON document.
+
+    With `max_age`, a copy fetched by any process on this host less than
+    `max_age` seconds ago is used instead.
+    """
+    if not max_age:
+        return get(url, resource, params=params).json()
+
+    key = f"{url}?{urllib.parse.urlencode(sorted((params or {}).items()))}"
+    store = cache.shared()
+    with store.lock(key):
+        entry = store.get(key)
+        if entry is not None and entry.age < max_age:
+            metrics.CACHE_REQUESTS.inc(cache=resource, result="hit")
+        else:
+            metrics.CACHE_REQUESTS.inc(cache=resource, result="miss")
+            response = get(url, resource, params=params)
+            if not response.ok:
+                return response.json()
+            entry = store.put(key, response.content)
+
+    with _decoded_lock:
+        decoded = _decoded.get(key)
+        if decoded is None or decoded[0] != entry.fetched:
+            decoded = (entry.fetched, json.loads(entry.value))
+            _decoded[key] = decoded
+    return decoded[1]
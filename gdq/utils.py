@@ -6,6 +6,8 @@ from typing import TypeVar
 
 X = TypeVar("X")
 now: datetime = datetime.now(timezone.utc)
+# Set when stdout carries data rather than a terminal display.
+quiet: bool = False
 
 
 def flatten(string: str) -> str:
@@ -49,7 +51,7 @@ def short_number(number: float) -> str:
     return f"{number:,.0f}"
 
 
-def slow_refresh_with_progress(interval: int = 30) -> Iterable[int]:
+def slow_refresh_with_progress(interval: float = 30) -> Iterable[int]:
     resolution = 0.10
     ticks = int(interval / resolution)
 
@@ -69,6 +71,10 @@ def slow_refresh_with_progress(interval: int = 30) -> Iterable[int]:
 
 
 def show_iterable_progress(iterable: Collection[X], offset: int = 0) -> Iterable[X]:
+    if quiet:
+        yield from iterable
+        return
+
     for i, item in enumerate(iterable):
         term_width, term_height = shutil.get_terminal_size()
         print(
@@ -88,6 +94,17 @@ def timedelta_as_hours(delta: timedelta) -> str:
     return f"{hours:.0f}:{minutes:02.0f}"
 
 
+_timestamp: tuple[datetime, int] = (now, int(now.timestamp()))
+
+
+def now_timestamp() -> int:
+    """`now` as epoch seconds, converted once per tick."""
+    global _timestamp
+    if _timestamp[0] is not now:
+        _timestamp = (now, int(now.timestamp()))
+    return _timestamp[1]
+
+
 def update_now() -> datetime:
     global now
     now = datetime.now(timezone.utc).replace(microsecond=0)
@@ -1,7 +1,38 @@
-from bus.desert_bus import dollars_to_hours, hours_to_dollars
+import itertools
+import math
+from datetime import datetime, timedelta, timezone
+
+from bus.desert_bus import (
+    HOUR_THRESHOLDS,
+    RECORD_TABLE,
+    RECORDS,
+    DesertBus,
+    MilestoneLadder,
+    dollars_to_hours,
+    dollars_to_hours_many,
+    estimate_total,
+    even_banner,
+    hours_to_dollars,
+    shift_banner,
+)
+from gdq import utils
 from gdq.money import Dollar
 
 
+def formula_hours(cents: int) -> int:
+    return math.floor(math.log((cents / 100 * 0.07) + 1) / math.log(1.07))
+
+
+def iterate_estimate(total: Dollar, elapsed: timedelta) -> Dollar:
+    # The original fixed-point iteration that estimate_total replaces.
+    future_hours = 0
+    future_total = total
+    while future_hours != dollars_to_hours(future_total):
+        future_hours = dollars_to_hours(future_total)
+        future_total = total * (timedelta(hours=future_hours) / elapsed)
+    return future_total
+
+
 class TestDesertBus:
     def test_dollars_to_hours(self):
         # Hours are returned as integers, ensure that the hour count changes
@@ -12,8 +43,109 @@ class TestDesertBus:
         assert dollars_to_hours(Dollar(353.27)) == 47
         assert dollars_to_hours(Dollar(353.28)) == 48
 
+    def test_hour_thresholds(self):
+        # Every looked up boundary matches the formula on both sides.
+        for hours, cents in enumerate(HOUR_THRESHOLDS):
+            assert dollars_to_hours(Dollar(cents / 100)) == formula_hours(cents) == hours
+            if hours:
+                assert dollars_to_hours(Dollar((cents - 1) / 100)) == formula_hours(cents - 1) == hours - 1
+
+    def test_dollars_to_hours_many(self):
+        totals = [Dollar(353.28), Dollar(58.17), Dollar(0), Dollar(10**13), Dollar(58.18), Dollar(353.27)]
+        assert dollars_to_hours_many(totals) == [dollars_to_hours(total) for total in totals]
+        assert dollars_to_hours_many(totals)[:3] == [48, 23, 0]
+
     def test_hours_to_dollars(self):
         # Dollars are returned to the nearest penny and not the next penny
         # despite the error involved.
         assert hours_to_dollars(24) == Dollar(sum(1.07**i for i in range(24)))
         assert hours_to_dollars(48) == Dollar(sum(1.07**i for i in range(48)))
+
+    def test_estimate_total(self):
+        for total in (Dollar(0.5), Dollar(58.18), Dollar(3_715.89), Dollar(443_383.33), Dollar(1_251_304.91)):
+            for elapsed in (timedelta(minutes=1), timedelta(hours=5), timedelta(days=3), timedelta(days=7)):
+                assert estimate_total(total, elapsed) == iterate_estimate(total, elapsed)
+
+    def test_estimate_total_before_start(self):
+        assert estimate_total(Dollar(1_000), timedelta()) == Dollar(1_000)
+        assert estimate_total(Dollar(1_000), timedelta(hours=-1)) == Dollar(1_000)
+
+    def test_milestone_ladder(self):
+        ladder = MilestoneLadder()
+
+        first = list(itertools.islice(ladder.above(Dollar(0)), 9))
+        hours = [f"hour {hour}" for hour in range(1, 8)]
+        assert [milestone.label for milestone in first] == [*hours, "$10.00", "hour 8"]
+
+        # Moving up the ladder only shows milestones above the new total.
+        upcoming = list(itertools.islice(ladder.above(Dollar(22_805.00)), 200))
+        assert upcoming == sorted(upcoming)
+        assert all(milestone.total > Dollar(22_805.00) for milestone in upcoming)
+        assert [milestone.record for milestone in upcoming if milestone.record][:3] == sorted(RECORDS)[1:4]
+
+        # And it can move back down again.
+        assert next(ladder.above(Dollar(0))) == first[0]
+
+    def test_banners(self):
+        items = ["a", "bb", "ccc"]
+        assert even_banner(items, 20) == ["  a   ", "  bb  ", " ccc  "]
+        assert items == ["a", "bb", "ccc"]
+
+        shift_banner.cache_clear()
+        for _ in range(3):
+            assert shift_banner(80, (True, False, False, False)) == shift_banner(80, (True, False, False, False))
+        assert shift_banner.cache_info().misses == 1
+        assert shift_banner(20, None) == "|".join(even_banner(list("OMEGA"), 20))
+
+    def test_published_state(self):
+        bus = DesertBus(start=utils.now - timedelta(hours=10))
+        bus.total = Dollar(5_000)
+        state = bus.frame()
+
+        assert bus.frame() is state
+        assert (state.total, state.hours) == (Dollar(5_000), dollars_to_hours(Dollar(5_000)))
+        assert state.upcoming[0].total > Dollar(5_000)
+
+        bus.total = Dollar(6_000)
+        assert bus.frame() is not state
+        # Frames already holding the old state are unaffected.
+        assert state.total == Dollar(5_000)
+
+    def test_frame_cached_per_minute(self, monkeypatch):
+        bus = DesertBus(start=utils.now - timedelta(hours=10))
+        bus.total = Dollar(5_000)
+        monkeypatch.setattr(utils, "now", utils.now + timedelta(minutes=3))
+        frame = bus.frame()
+
+        assert frame.minute != bus.state.minute
+        assert bus.frame() is frame
+        monkeypatch.setattr(utils, "now", utils.now + timedelta(minutes=1))
+        assert bus.frame() is not frame
+
+    def test_record_table(self):
+        assert RECORD_TABLE.totals == tuple(sorted(record.total for record in RECORDS))
+        assert RECORD_TABLE.hours[:4] == (109, 125, 135, 141)
+        assert RECORD_TABLE.count_above(Dollar(0)) == len(RECORDS)
+        assert RECORD_TABLE.count_above(RECORD_TABLE.totals[1]) == len(RECORDS) - 2
+        assert RECORD_TABLE.count_passed(108.5) == 0
+        assert RECORD_TABLE.count_passed(125) == 2
+
+    def test_footer(self, monkeypatch):
+        # Expected lines were drawn by the footer before it used RecordTable.
+        start = datetime(2024, 11, 9, 18, tzinfo=timezone.utc)
+        cases = {
+            (30, 400_000, 60, False): "[30:17]────────🚍                     🚏   🚏  🚏 🏁[120:43]",
+            (100, 600_000, 70, False): "[100:17]─────────────────────────────────🚍  🚏    🚏  🚏 🚏 🏁[56:43]",
+            (140, 1_000_000, 80, False): (
+                "[140:17]───────────🚍🚏                   🚏   🚏     🚏      🚏 🚏 🚏 🏁[23:43]"
+            ),
+            (140, 1_000_000, 80, True): (
+                "[140:17]─────────────────────────────────────────────────────🚍  🚏🚏🚏🏁[23:43]"
+            ),
+        }
+        for (elapsed, total, width, overall), expected in cases.items():
+            monkeypatch.setattr(utils, "now", start + timedelta(hours=elapsed, minutes=17))
+            bus = DesertBus(start=start)
+            bus.total = Dollar(total)
+            bus.width = width
+            assert list(bus.footer(bus.frame(), overall=overall)) == [expected]
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta, timezone
+
+from bus.desert_bus import dollars_to_hours
+from bus.history import SAMPLE, History
+from gdq.money import Dollar
+
+START = datetime(2024, 11, 9, 14, tzinfo=timezone.utc)
+
+
+class TestHistory:
+    def test_ring_wraps(self):
+        history = History(capacity=4, windows=(60,))
+        for second in range(10):
+            history.append(second, Dollar(second))
+
+        assert len(history) == 4
+        assert history.latest == (9, Dollar(9))
+        # Only the last four samples remain to measure from.
+        assert history.rate(60) == Dollar(3600)
+
+    def test_rates(self):
+        history = History(windows=(60, 600))
+        for second in range(0, 601, 10):
+            # $1 a second for the first 9 minutes, then $10 a second.
+            total = second if second <= 540 else 540 + (second - 540) * 10
+            history.append(second, Dollar(total))
+
+        assert history.rates() == {60: Dollar(36_000), 600: Dollar(1140 / 600 * 3600)}
+
+    def test_empty(self):
+        history = History()
+        assert history.latest is None
+        assert history.rate(history.windows[0]) == Dollar()
+        assert history.forecast(START) is None
+
+    def test_persistence(self, tmp_path):
+        path = tmp_path / "bus.history"
+        history = History(path=path)
+        for minute in range(5):
+            history.append(START.timestamp() + minute * 60, Dollar(minute * 100))
+
+        # A sample cut short by a crash is dropped on reload.
+        with path.open("ab") as history_file:
+            history_file.write(SAMPLE.pack(0, 0)[:5])
+        reloaded = History(capacity=3, path=path)
+        assert len(reloaded) == 3
+        assert reloaded.latest == history.latest
+        assert reloaded.rate(300) == Dollar(6000)
+
+    def test_forecast(self):
+        history = History(windows=(3600,))
+        history.append(START.timestamp(), Dollar(0))
+        history.append((START + timedelta(hours=1)).timestamp(), Dollar(1000))
+
+        # Keep extending the run while $1000 an hour pays for the time left.
+        hours = dollars_to_hours(Dollar(1000))
+        while dollars_to_hours(Dollar(1000) * hours) > hours:
+            hours += 1
+        assert history.forecast(START) == hours
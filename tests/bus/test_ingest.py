@@ -0,0 +1,127 @@
+import threading
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+from bus.__main__ import SubscribeHandler
+from bus.desert_bus import DesertBus
+from bus.history import SAMPLE, History
+from bus.ingest import Coalescer, Supervisor
+from gdq import metrics, transport, utils
+from gdq.money import Dollar
+
+
+class CountingBus(DesertBus):
+    publishes = 0
+
+    def publish(self, total: Dollar) -> None:
+        self.publishes += 1
+        super().publish(total)
+
+
+class LocalPubNub:
+    """Stands in for PubNub, delivering messages to a listener from its own thread."""
+
+    def __init__(self, listener: SubscribeHandler):
+        self.listener = listener
+        self.stopped = False
+
+    def stop(self):
+        self.stopped = True
+
+    def deliver(self, messages):
+        def run():
+            for message in messages:
+                self.listener.message(self, SimpleNamespace(message=message))
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+
+
+class TestCoalescer:
+    def test_single_message_is_published_immediately(self):
+        bus = CountingBus(start=utils.now - timedelta(hours=1))
+        Coalescer(bus, window=10).receive(Dollar(100))
+
+        assert bus.publishes == 2
+        assert bus.total == Dollar(100)
+
+    def test_burst(self):
+        bus = CountingBus(start=utils.now - timedelta(hours=1))
+        coalescer = Coalescer(bus, window=0.05)
+        pubnub = LocalPubNub(SubscribeHandler(bus, Supervisor(coalescer)))
+        messages = [1_000 + cents / 100 for cents in range(20_000)]
+
+        started = time.monotonic()
+        pubnub.deliver(messages)
+        elapsed = time.monotonic() - started
+        time.sleep(0.1)
+
+        # The first message, one per window during the burst, and the trailing total.
+        assert bus.publishes - 1 <= elapsed / 0.05 + 2
+        assert bus.total == Dollar(messages[-1])
+        assert len(coalescer.history) == len(messages)
+        assert coalescer.history.latest[1] == Dollar(messages[-1])
+        assert not pubnub.stopped
+
+    def test_empty_history_is_kept(self, tmp_path):
+        bus = CountingBus(start=utils.now - timedelta(hours=1))
+        bus.history = History(path=tmp_path / "bus.history")
+        coalescer = Coalescer(bus, window=10, history=bus.history)
+        coalescer.receive(Dollar(100))
+
+        assert coalescer.history is bus.history
+        assert len(bus.history) == 1
+        assert (tmp_path / "bus.history").stat().st_size == SAMPLE.size
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, total: float = 0, etag: str = ""):
+        self.status_code = status_code
+        self.headers = {"ETag": etag} if etag else {}
+        self._total = total
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"total": self._total}
+
+
+class TestSupervisor:
+    def test_polling(self, monkeypatch):
+        responses = [FakeResponse(200, 100, etag='"a"'), FakeResponse(304), FakeResponse(200, 100, etag='"b"')]
+        sent = []
+
+        def get(url, resource, headers):
+            sent.append(headers)
+            return responses.pop(0)
+
+        monkeypatch.setattr(transport, "get", get)
+        bus = CountingBus(start=utils.now - timedelta(hours=1))
+        supervisor = Supervisor(Coalescer(bus, window=0), min_interval=1, max_interval=4)
+
+        supervisor.backoff(supervisor.poll())
+        assert bus.total == Dollar(100)
+        assert supervisor.interval == 1
+        assert 'gdq_total{event="bus"} 100.0' in metrics.render()
+
+        for _ in range(2):
+            supervisor.backoff(supervisor.poll())
+        assert bus.total == Dollar(100)
+        assert supervisor.interval == 4
+        assert sent == [{}, {"If-None-Match": '"a"'}, {"If-None-Match": '"a"'}]
+
+    def test_stale(self):
+        bus = DesertBus(start=utils.now - timedelta(hours=1))
+        supervisor = Supervisor(Coalescer(bus), stale_after=0.01)
+
+        time.sleep(0.02)
+        supervisor.check_stale()
+        assert bus.offline
+        assert "(offline)" in list(bus.header(bus.frame()))[1]
+
+        supervisor.receive(Dollar(50))
+        assert not bus.offline
+        assert bus.total == Dollar(50)
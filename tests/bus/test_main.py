@@ -0,0 +1,76 @@
+import signal
+import time
+from datetime import datetime, timedelta, timezone
+
+from bus.__main__ import DisplayThread, redraw_on_resize, wait_for_change
+from bus.desert_bus import DesertBus
+from gdq import utils
+from gdq.money import Dollar
+
+
+class FakeDisplay:
+    term_w = 80
+    term_h = 24
+
+    def __init__(self):
+        self.painted = 0
+
+    def refresh_terminal(self):
+        pass
+
+    def update_header(self, header):
+        self.painted += 1
+
+    def update_body(self, body):
+        pass
+
+    def update_footer(self, footer):
+        pass
+
+
+class TestNextChange:
+    def test_before_start(self):
+        bus = DesertBus(start=datetime(2024, 11, 9, 18, tzinfo=timezone.utc))
+        assert bus.next_change(datetime(2024, 11, 9, 17, 59, 30, 250_000, tzinfo=timezone.utc)) == 0.75
+
+    def test_running(self):
+        bus = DesertBus(start=datetime(2024, 11, 9, 18, 0, 20, tzinfo=timezone.utc))
+        # The next elapsed minute is 20 seconds away, the next wall-clock minute 50.
+        assert bus.next_change(datetime(2024, 11, 9, 19, 0, 10, tzinfo=timezone.utc)) == 10
+        assert bus.next_change(datetime(2024, 11, 9, 19, 0, 30, tzinfo=timezone.utc)) == 30
+
+
+class TestDisplayThread:
+    def test_redraws_only_on_change(self):
+        utils.update_now()
+        thread = DisplayThread(DesertBus(start=utils.now - timedelta(hours=2)))
+        display = thread.display = FakeDisplay()
+
+        assert thread.draw()
+        assert not thread.draw()
+        assert display.painted == 1
+
+        thread.bus.total = Dollar(1000)
+        assert thread.draw()
+        assert not thread.draw()
+
+        display.term_w = 100
+        assert thread.draw()
+        assert display.painted == 3
+
+    def test_resize_wakes_display(self):
+        utils.update_now()
+        bus = DesertBus(start=utils.now - timedelta(hours=2))
+        bus.changed.clear()
+        previous = signal.getsignal(signal.SIGWINCH)
+        try:
+            redraw_on_resize(bus)
+            signal.raise_signal(signal.SIGWINCH)
+        finally:
+            signal.signal(signal.SIGWINCH, previous)
+        assert bus.changed.is_set()
+
+        started = time.monotonic()
+        wait_for_change(bus, last_frame=0)
+        assert time.monotonic() - started < 1
+        assert not bus.changed.is_set()
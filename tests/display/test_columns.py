@@ -0,0 +1,70 @@
+import argparse
+
+from gdq import utils
+from gdq.display.columns import Column, ColumnLayout
+from gdq.events.horaro import HoraroTracker
+from gdq.models import Run
+
+
+class Counter:
+    def __init__(self, name: str, length: int):
+        self.name = name
+        self.length = length
+        self.renders = 0
+
+    def __call__(self, width: int):
+        self.renders += 1
+        for index in range(self.length):
+            yield f"{self.name}{index}"[:width]
+
+
+class TestColumnLayout:
+    def test_widths(self):
+        layout = ColumnLayout()
+        columns = [Column(Counter("a", 1), ()), Column(Counter("b", 1), (), weight=2)]
+        assert layout.widths(columns, 80) == [27, 52]
+
+    def test_merge(self):
+        layout = ColumnLayout()
+        columns = [Column(Counter("a", 3), ()), Column(Counter("b", 1), ())]
+        assert layout.render(columns, 9, 10) == ["a0   b0  ", "a1       ", "a2       "]
+        assert layout.render(columns, 9, 2) == ["a0   b0  ", "a1       "]
+
+    def test_height_grows_back(self):
+        layout = ColumnLayout()
+        columns = [Column(Counter("a", 30), ()), Column(Counter("b", 30), ())]
+        assert [len(layout.render(columns, 9, height)) for height in (20, 5, 20)] == [20, 5, 20]
+
+    def test_only_changed_columns_are_rendered(self):
+        layout = ColumnLayout()
+        schedule, incentives = Counter("s", 100), Counter("i", 100)
+        source = object()
+
+        for minute in (1, 1, 1, 2):
+            layout.render(
+                [Column(schedule, sources=(source,), key=(0,)), Column(incentives, sources=(source,), key=(minute,))],
+                width=80, height=20,
+            )
+        assert (schedule.renders, incentives.renders) == (1, 2)
+
+        layout.render(
+            [Column(schedule, sources=(object(),), key=(0,)), Column(incentives, sources=(source,), key=(2,))],
+            width=80, height=20,
+        )
+        assert (schedule.renders, incentives.renders) == (2, 2)
+
+
+class TestSplitPane:
+    def test_height(self):
+        utils.update_now()
+        tracker = HoraroTracker("group", "event", {})
+        start = utils.now_timestamp()
+        tracker.schedules = [
+            [Run(f"Game {index}", "PC", "any%", [runner], [], start + index * 1800, 1800, index) for index in range(50)]
+            for runner in ("runner a", "runner b")
+        ]
+        args = argparse.Namespace(split_pane=True, hide_incentives=True, min_width=20)
+
+        assert len(list(tracker.render(width=120, args=args, height=7))) == 7
+        # Without a height, a page of the viewport is rendered.
+        assert len(list(tracker.render(width=120, args=args))) == tracker.viewport.page
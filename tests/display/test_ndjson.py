@@ -0,0 +1,36 @@
+import io
+import json
+
+from gdq.display.ndjson import NDJSONWriter, diff
+
+
+class TestNDJSON:
+    def test_diff(self):
+        old = {"total": 1.0, "bus": {"hours": 5, "end": "a"}, "gone": True}
+        new = {"total": 2.0, "bus": {"hours": 5}}
+
+        changed, removed = diff(old, new)
+        assert changed == {"total": 2.0}
+        assert sorted(removed) == ["bus.end", "gone"]
+
+    def test_writer_deltas(self):
+        stream = io.StringIO()
+        writer = NDJSONWriter(stream)
+        snapshot = {"total": 1.0, "next": [{"game": "A long game name" * 10}]}
+
+        assert writer.emit(snapshot)
+        assert not writer.emit(dict(snapshot))
+        assert writer.emit({**snapshot, "total": 2.0})
+
+        first, second = (json.loads(line) for line in stream.getvalue().splitlines())
+        assert first == {"type": "snapshot", "seq": 0, "data": snapshot}
+        assert second == {"type": "delta", "seq": 1, "changed": {"total": 2.0}}
+
+    def test_writer_periodic_snapshot(self):
+        stream = io.StringIO()
+        writer = NDJSONWriter(stream, full_every=1)
+        for total in range(3):
+            writer.emit({"total": total, "padding": "x" * 100})
+
+        types = [json.loads(line)["type"] for line in stream.getvalue().splitlines()]
+        assert types == ["snapshot", "delta", "snapshot"]
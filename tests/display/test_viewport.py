@@ -0,0 +1,61 @@
+import argparse
+
+from gdq.display.viewport import Viewport
+
+
+class Block:
+    def __init__(self, name: str, size: int):
+        self.name = name
+        self.size = size
+        self.rendered = 0
+
+    def height(self, width: int, args: argparse.Namespace) -> int:
+        return self.size
+
+    def render(self, width: int, args: argparse.Namespace):
+        self.rendered += 1
+        return [f"{self.name}{index}" for index in range(self.size)]
+
+
+class Stale(Block):
+    def height(self, width: int, args: argparse.Namespace) -> int:
+        return self.size + 2
+
+
+class TestViewport:
+    def test_only_visible_rows_are_rendered(self):
+        rows = [Block(str(index), 3) for index in range(1000)]
+        viewport = Viewport()
+        viewport.scroll(1500)
+
+        lines = viewport.lines(rows, 80, argparse.Namespace())
+        assert [next(lines) for _ in range(4)] == ["5000", "5001", "5002", "5010"]
+        assert sum(row.rendered for row in rows) == 2
+
+    def test_keys(self):
+        viewport = Viewport()
+        viewport.page = 10
+        for key in "jj  k":
+            viewport.handle_key(key)
+        assert viewport.offset == 21
+        viewport.handle_key("b")
+        viewport.handle_key("b")
+        viewport.handle_key("b")
+        assert viewport.offset == 0
+
+    def test_scrolling_past_the_end(self):
+        rows = [Block(str(index), 2) for index in range(10)]
+        viewport = Viewport()
+        viewport.page = 5
+        viewport.scroll(100)
+
+        # The last page is shown straight away rather than an empty frame.
+        assert list(viewport.lines(rows, 80, argparse.Namespace())) == ["71", "80", "81", "90", "91"]
+        assert viewport.offset == 15
+
+    def test_height_overstates_render(self):
+        viewport = Viewport()
+        viewport.scroll(2)
+        rows = [Stale("a", 1), Block("b", 2)]
+
+        assert list(viewport.lines(rows, 80, argparse.Namespace())) == ["b0", "b1"]
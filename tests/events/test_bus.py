@@ -0,0 +1,26 @@
+import argparse
+from datetime import timedelta
+
+from gdq import utils
+from gdq.events.bus import BusTracker
+from gdq.money import Dollar
+
+
+class TestBusTracker:
+    def test_one_state_per_screen(self, monkeypatch):
+        utils.update_now()
+        tracker = BusTracker(start=utils.now - timedelta(hours=2))
+        args = argparse.Namespace(extended_header=False, overall=False)
+        tracker.bus.total = Dollar(100)
+
+        drawn = []
+        for part in ("header", "render", "footer"):
+            monkeypatch.setattr(tracker.bus, part, lambda state, **_: drawn.append(state) or [])
+
+        list(tracker.header(width=80, args=args))
+        tracker.bus.total = Dollar(5000)
+        list(tracker.render(width=80, args=args))
+        list(tracker.footer(width=80, args=args))
+
+        assert drawn[0].total == Dollar(100)
+        assert drawn[0] is drawn[1] is drawn[2]
@@ -0,0 +1,75 @@
+from datetime import datetime, timezone
+
+from gdq import changes, utils
+from gdq.events.gdq import GDQTracker
+from gdq.models import DonationIncentive, Run, SingleEvent
+from gdq.money import Dollar
+from gdq.parsers import gdq_api
+
+
+def runs(current: float) -> list[Run]:
+    incentive = DonationIncentive(
+        incentive_id=1,
+        description="Name the character",
+        short_desc="Name",
+        current=Dollar(current),
+        state="OPEN",
+        total=Dollar(100),
+    )
+    return [Run("Game", "PC", "any%", ["runner"], [incentive], utils.now_timestamp(), 1800, 0)]
+
+
+def event(total: float) -> SingleEvent:
+    return SingleEvent(
+        event_id=1,
+        name="Games Done Quick",
+        short_name="gdq",
+        _start_time=datetime.now(tz=timezone.utc),
+        _total=Dollar(total),
+        _charity="",
+        target=Dollar(),
+        _offset=Dollar(),
+    )
+
+
+class TestGDQTracker:
+    def test_first_refresh_is_not_a_change(self, monkeypatch):
+        tracker = GDQTracker("https://example.org/tracker/")
+        tracker.current_event = event(1000)
+        totals = iter([10, 10, 50])
+        monkeypatch.setattr(gdq_api, "get_runs", lambda *_: runs(next(totals)))
+
+        tracker.read_schedules()
+        assert tracker.incentive_changes == []
+        assert tracker.schedule_changes == []
+        assert list(tracker.incentives) == [1]
+
+        tracker.read_schedules()
+        assert tracker.incentive_changes == []
+
+        tracker.read_schedules()
+        assert [change.kind for change in tracker.incentive_changes] == [changes.TOTAL]
+
+    def test_new_schedule_is_added(self):
+        tracker = GDQTracker("https://example.org/tracker/")
+        tracker.update_schedules([runs(10)])
+        assert tracker.schedule_changes == []
+
+        # A second event's schedule appears.
+        tracker.update_schedules([tracker.schedules[0], runs(10)])
+        assert [change.kind for change in tracker.schedule_changes] == [changes.ADDED]
+
+        tracker.update_schedules([tracker.schedules[0]])
+        assert [change.kind for change in tracker.schedule_changes] == [changes.REMOVED]
+
+    def test_total_changed(self, monkeypatch):
+        tracker = GDQTracker("https://example.org/tracker/")
+        totals = iter([1000, 1000, 1500])
+        monkeypatch.setattr(gdq_api, "get_events", lambda *_, **__: [event(next(totals))])
+
+        changed = []
+        for _ in range(3):
+            tracker.read_events()
+            changed.append(tracker.total_changed)
+        # The first total is not a change.
+        assert changed == [False, False, True]
@@ -0,0 +1,201 @@
+import argparse
+import dataclasses
+import os
+import time
+import timeit
+from datetime import datetime, timedelta
+
+import pytest
+import xdg
+
+from gdq import cache, transport, utils
+from gdq.events.horaro import HoraroTracker
+from gdq.parsers import horaro, schedule_file
+
+KEY_MAP = {"game": "Game", "platform": "Platform", "category": "Category", "runners": "Runner"}
+
+
+def horaro_data(count: int) -> dict:
+    return {
+        "updated": "2024-01-07T16:00:00+00:00",
+        "timezone": "America/New_York",
+        "columns": ["Runner", "Game", "Category", "Platform"],
+        "items": [
+            {
+                "scheduled_t": 1_704_556_800 + index * 1800,
+                "length_t": 1800,
+                "data": [f"runner {index % 7}", f"Game {index}", "any%", None if index % 3 else "PC"],
+            }
+            for index in range(count)
+        ],
+    }
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, data: dict | None = None):
+        self.status_code = status_code
+        self._data = data
+
+    def json(self):
+        if self._data is None:
+            raise ValueError("No content")
+        return {"data": self._data}
+
+
+class TestScheduleFile:
+    def test_round_trip(self, tmp_path):
+        runs = horaro.parse_schedule(horaro_data(50), KEY_MAP)
+        path = tmp_path / "test.schedule"
+        schedule_file.write(path, runs, columns=list(KEY_MAP), timezone="America/New_York", validator="v1")
+
+        loaded = schedule_file.ScheduleFile(path)
+        assert loaded.validator == "v1"
+        assert len(loaded) == 50
+        assert list(loaded) == runs
+        assert loaded[-1] == runs[-1]
+        assert loaded[1].platform is None
+
+    def test_bad_version(self, tmp_path):
+        path = tmp_path / "test.schedule"
+        path.write_bytes(b"GDQS\x00\x00" + bytes(30))
+        assert schedule_file.load(path) is None
+
+    def test_replaced_files_stay_usable(self, tmp_path):
+        path = tmp_path / "test.schedule"
+        files = []
+        for count in (10, 11, 12):
+            schedule_file.write(path, horaro.parse_schedule(horaro_data(count), KEY_MAP), list(KEY_MAP), "UTC", "v1")
+            files.append(schedule_file.load(path)[0])
+
+        # Callers may still hold any of them, so none are closed.
+        assert [len(loaded) for loaded in files] == [10, 11, 12]
+        assert [loaded.item_key(9) for loaded in files[1:]] == [files[0].item_key(9)] * 2
+
+
+class TestParseSchedule:
+    def test_unchanged_runs_are_reused(self, tmp_path):
+        data = horaro_data(20)
+        path = tmp_path / "test.schedule"
+        schedule_file.write(path, horaro.parse_schedule(data, KEY_MAP), list(KEY_MAP), data["timezone"], "v1")
+        previous = schedule_file.ScheduleFile(path)
+
+        # One run changes.
+        data["items"][5]["length_t"] = 600
+        runs = horaro.parse_schedule(data, KEY_MAP, previous)
+
+        assert runs == horaro.parse_schedule(data, KEY_MAP)
+        assert runs[5] is not previous[5]
+        assert runs[6] is previous[6]
+
+        # A new one is inserted at the front, moving the rest along.
+        data["items"].insert(0, {"scheduled_t": 1_704_550_000, "length_t": 60, "data": ["a", "b", "c", None]})
+        runs = horaro.parse_schedule(data, KEY_MAP, previous)
+
+        assert runs == horaro.parse_schedule(data, KEY_MAP)
+        assert runs[7] == dataclasses.replace(previous[6], run_id=7)
+        assert previous[6].run_id == 6
+
+
+class TestLargeSchedule:
+    def test_times(self, monkeypatch):
+        data = horaro_data(5000)
+        runs = horaro.parse_schedule(data, KEY_MAP)
+        # Part way through the 2500th run
+        monkeypatch.setattr(utils, "now", datetime.fromtimestamp(1_704_556_800 + 2500 * 1800 + 600).astimezone())
+
+        live = [run for run in runs if run.is_live]
+        assert len(live) == 2500
+        assert live[0].remaining == timedelta(seconds=1200)
+        assert live[0].delta == "  NOW  "
+        assert live[1].delta == "0:00:20"
+        assert live[-1].delta == "52 DAYS"
+        assert runs[0].start.isoformat() == "2024-01-06T11:00:00-05:00"
+        assert runs[0].end == runs[1].start
+
+    @pytest.mark.skipif(not os.environ.get("GDQ_BENCHMARK"), reason="set GDQ_BENCHMARK=1 to time")
+    def test_benchmark(self, monkeypatch):
+        # Run with: GDQ_BENCHMARK=1 python -m pytest -s -k benchmark
+        data = horaro_data(5000)
+        runs = horaro.parse_schedule(data, KEY_MAP)
+        monkeypatch.setattr(utils, "now", datetime.fromtimestamp(1_704_556_800 + 2500 * 1800 + 600).astimezone())
+        tracker = HoraroTracker("group", "event", KEY_MAP)
+        tracker.schedules = [runs]
+        args = argparse.Namespace()
+
+        timings = {
+            "parse_schedule": lambda: horaro.parse_schedule(data, KEY_MAP),
+            "live_runs": tracker.live_runs,
+            "snapshot": lambda: tracker.snapshot(args),
+        }
+        for name, function in timings.items():
+            best = min(timeit.repeat(function, number=10, repeat=5)) / 10
+            print(f"{name:<16}{best * 1000:6.1f} ms")
+
+
+class TestTicker:
+    def test_ticker_agrees(self, monkeypatch):
+        data = horaro_data(100)
+        runs = horaro.parse_schedule(data, KEY_MAP)
+        ticker = {"previous": None, "current": data["items"][40], "next": dict(data["items"][41])}
+        monkeypatch.setattr(transport, "get", lambda url, resource: FakeResponse(200, {"ticker": ticker}))
+
+        assert horaro.ticker_agrees("event", "stream", runs)
+
+        # The next run was pushed back since the schedule was fetched.
+        ticker["next"]["scheduled_t"] += 300
+        assert not horaro.ticker_agrees("event", "stream", runs)
+
+        ticker["current"] = ticker["next"] = None
+        assert horaro.ticker_agrees("event", "stream", runs)
+
+
+class TestReadSchedule:
+    def test_refresh(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(xdg, "XDG_CACHE_HOME", tmp_path)
+        monkeypatch.setattr(cache, "_shared", cache.SharedCache(tmp_path / "cache.sqlite3"))
+        responses = [FakeResponse(200, horaro_data(10)), FakeResponse(304)]
+        sent = []
+
+        def get(url, resource, headers):
+            sent.append(headers)
+            return responses.pop(0)
+
+        monkeypatch.setattr(transport, "get", get)
+
+        runs = list(horaro.read_schedule("event", "stream", KEY_MAP))
+        assert len(runs) == 10
+        # Fresh enough to skip the network entirely
+        assert list(horaro.read_schedule("event", "stream", KEY_MAP)) == runs
+        assert len(sent) == 1
+
+        # A longer freshness window than the schedule's age
+        assert list(horaro.read_schedule("event", "stream", KEY_MAP, max_age=3600)) == runs
+        assert len(sent) == 1
+
+        path = tmp_path / "gdq" / "horaro" / "event-stream.schedule"
+        old = time.time() - horaro.MAX_AGE - 1
+        os.utime(path, (old, old))
+        assert list(horaro.read_schedule("event", "stream", KEY_MAP)) == runs
+        assert sent[1] == {"If-Modified-Since": "Sun, 07 Jan 2024 16:00:00 GMT"}
+        assert path.stat().st_mtime > old
+
+    def test_rewritten_between_refreshes(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(xdg, "XDG_CACHE_HOME", tmp_path)
+        monkeypatch.setattr(cache, "_shared", cache.SharedCache(tmp_path / "cache.sqlite3"))
+        counts = [10, 12, 14]
+
+        def get(url, resource, headers):
+            return FakeResponse(200, horaro_data(counts.pop(0)))
+
+        monkeypatch.setattr(transport, "get", get)
+
+        path = tmp_path / "gdq" / "horaro" / "event-stream.schedule"
+        tracker = HoraroTracker("event", "stream", KEY_MAP, max_age=0)
+        tracker.refresh_all()
+        for count in (11, 13):
+            # Another process replaces the file the tracker is still holding.
+            schedule_file.write(path, horaro.parse_schedule(horaro_data(count), KEY_MAP), list(KEY_MAP), "UTC", "v1")
+            tracker.refresh_all()
+
+        assert len(tracker.schedules[0]) == 14
+        assert tracker.schedules[0][13].game == "Game 13"
@@ -0,0 +1,47 @@
+import threading
+import time
+
+from gdq.cache import SharedCache
+
+
+class TestSharedCache:
+    def test_entries_are_shared(self, tmp_path):
+        first = SharedCache(tmp_path / "cache.sqlite3")
+        second = SharedCache(tmp_path / "cache.sqlite3")
+
+        assert first.get("key") is None
+        first.put("key", b"value", validator="v1")
+
+        entry = second.get("key")
+        assert entry is not None
+        assert (entry.value, entry.validator) == (b"value", "v1")
+        assert entry.age < 1
+
+    def test_touch(self, tmp_path):
+        store = SharedCache(tmp_path / "cache.sqlite3")
+        old = store.put("key", b"value")
+        time.sleep(0.01)
+        store.touch("key")
+
+        assert store.get("key").fetched > old.fetched
+
+    def test_lock_is_exclusive(self, tmp_path):
+        store = SharedCache(tmp_path / "cache.sqlite3")
+        order = []
+
+        def fetch(name):
+            with store.lock("key"):
+                order.append(f"{name} start")
+                time.sleep(0.05)
+                order.append(f"{name} end")
+
+        threads = [threading.Thread(target=fetch, args=(name,)) for name in "ab"]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert order in (
+            ["a start", "a end", "b start", "b end"],
+            ["b start", "b end", "a start", "a end"],
+        )
@@ -0,0 +1,115 @@
+import argparse
+from dataclasses import replace
+
+from gdq import changes
+from gdq.changes import ADDED, EDITED, REMOVED, RETIMED, diff_schedule, diff_schedule_files
+from gdq.models import Choice, ChoiceIncentive, DonationIncentive, Run
+from gdq.money import Dollar
+from gdq.parsers import schedule_file
+
+
+def donation(current: float, **kwargs) -> DonationIncentive:
+    fields = {"description": "Name the character", "short_desc": "Name", "state": "OPEN", "total": Dollar(100)}
+    return DonationIncentive(incentive_id=1, current=Dollar(current), **{**fields, **kwargs})
+
+
+def bid_war(*totals: float, state: str = "OPEN") -> ChoiceIncentive:
+    options = [
+        Choice(name=f"option {index}", description="", total=Dollar(total)) for index, total in enumerate(totals)
+    ]
+    return ChoiceIncentive(
+        incentive_id=2,
+        description="Pick one",
+        short_desc="War",
+        current=Dollar(sum(totals)),
+        state=state,
+        options=options,
+    )
+
+
+def kinds(old, new) -> list[str]:
+    return [change.kind for change in changes.diff_incentives(changes.by_id(old), changes.by_id(new))]
+
+
+class TestDiffIncentives:
+    def test_unchanged(self):
+        assert kinds([donation(10), bid_war(1, 2)], [donation(10), bid_war(1, 2)]) == []
+
+    def test_added_and_removed(self):
+        assert kinds([donation(10)], [bid_war(1, 2)]) == [changes.ADDED, changes.REMOVED]
+
+    def test_donation(self):
+        assert kinds([donation(10)], [donation(50)]) == [changes.TOTAL]
+        closed = [changes.TOTAL, changes.GOAL_MET, changes.CLOSED]
+        assert kinds([donation(90)], [donation(120, state="CLOSED")]) == closed
+        assert kinds([donation(10)], [donation(10, description="Name the dog")]) == [changes.EDITED]
+
+    def test_bid_war(self):
+        assert kinds([bid_war(5, 3)], [bid_war(5, 8)]) == [changes.TOTAL, changes.LEADER]
+        assert kinds([bid_war(5, 3)], [bid_war(5, 3, 0)]) == [changes.OPTION_ADDED]
+        assert kinds([bid_war(5, 3)], [bid_war(5, 3, state="CLOSED")]) == [changes.CLOSED]
+
+    def test_rendered_lines_are_kept(self):
+        args = argparse.Namespace(hide_completed=False)
+        incentive = donation(10)
+        lines = incentive.lines(60, 10, args)
+        assert incentive.lines(60, 10, args) is lines
+        assert replace(incentive, current=Dollar(20)).lines(60, 10, args) != lines
+
+
+def run(run_id: int, game: str, start_t: int, estimate: int = 600) -> Run:
+    return Run(
+        game=game, platform="", category="any%", runners=["runner"], incentives=[],
+        start_t=start_t, estimate=estimate, run_id=run_id,
+    )
+
+
+class TestDiffSchedule:
+    def test_reschedule(self):
+        old = [run(1, "A", 0), run(2, "B", 600), run(3, "C", 1200), run(4, "D", 1800)]
+        new = [
+            run(1, "A", 0),
+            run(3, "C", 600),
+            run(2, "B", 1200),
+            run(4, "D (any%)", 1800),
+            run(5, "E", 2400),
+        ]
+
+        runs, changes = diff_schedule(old, new)
+
+        assert runs == new
+        assert runs[0] is old[0]
+        assert [(change.kind, change.run.game) for change in changes] == [
+            (RETIMED, "C"), (RETIMED, "B"), (EDITED, "D (any%)"), (ADDED, "E"),
+        ]
+        assert changes[2].previous is old[3]
+
+    def test_removed(self):
+        old = [run(1, "A", 0), run(2, "B", 600)]
+        runs, changes = diff_schedule(old, old[:1])
+        assert runs == old[:1]
+        assert [(change.kind, change.run.game) for change in changes] == [(REMOVED, "B")]
+
+    def test_old_runs_are_not_modified(self):
+        old = [run(1, "A", 0), run(2, "B", 600)]
+        new = [run(3, "A", 0), run(2, "B", 600)]
+        runs, changes = diff_schedule(old, new)
+
+        assert changes == []
+        assert runs[0] is new[0]
+        assert runs[1] is old[1]
+        assert old[0].run_id == 1
+
+    def test_schedule_files(self, tmp_path):
+        old_runs = [run(index, f"Game {index}", index * 600) for index in range(100)]
+        new_runs = [*old_runs[:50], run(50, "Game 50", 31_000), *old_runs[51:], run(100, "Game 100", 60_000)]
+        for name, runs in (("old", old_runs), ("new", new_runs)):
+            schedule_file.write(tmp_path / name, runs, ["game", "platform", "category", "runners"], "UTC", "")
+        old, new = schedule_file.ScheduleFile(tmp_path / "old"), schedule_file.ScheduleFile(tmp_path / "new")
+
+        changes = diff_schedule_files(old, new)
+
+        assert [(change.kind, change.run.game) for change in changes] == [(RETIMED, "Game 50"), (ADDED, "Game 100")]
+        # Only the runs that differ were built.
+        assert sorted(old._runs) == [50]
+        assert sorted(new._runs) == [50, 100]
@@ -0,0 +1,80 @@
+import json
+import socket
+import threading
+from datetime import datetime, timezone
+
+from gdq import daemon
+from gdq.runners.base import RunnerBase
+
+
+class FakeMarathon:
+    start = end = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    renders = 0
+
+    def refresh_all(self):
+        pass
+
+    def header(self, width, args):
+        yield "header".center(width)
+
+    def render(self, width, args, height=None):
+        self.renders += 1
+        for line in range(100):
+            yield str(line)
+
+    def footer(self, width, args):
+        yield "-" * width
+
+    def snapshot(self, args):
+        return {"total": 1.0}
+
+
+class FakeRunner(RunnerBase):
+    def get_marathon(self):
+        return FakeMarathon()
+
+
+class TestDaemon:
+    def test_frames_are_shared(self, tmp_path):
+        marathon = FakeMarathon()
+        server = daemon.FrameServer(str(tmp_path / "gdq.sock"), marathon, FakeRunner({}, []))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        try:
+            frames = []
+            for _ in range(3):
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                    client.connect(str(tmp_path / "gdq.sock"))
+                    client.sendall(b'{"width": 10, "height": 5}\n')
+                    frames.append(json.loads(client.makefile("rb").readline()))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert frames[0] == {"header": ["  header  "], "body": ["0", "1", "2"], "footer": ["-" * 10]}
+        assert frames[0] == frames[1] == frames[2]
+        assert marathon.renders == 1
+
+    def test_default_size(self):
+        assert daemon.FrameHandler.frame_size({"width": 100}) == (100, 24)
+        assert daemon.FrameHandler.frame_size({}) == daemon.DEFAULT_SIZE
+        assert daemon.FrameHandler.frame_size({"width": "wide", "height": 40}) == daemon.DEFAULT_SIZE
+
+    def test_bad_requests_get_an_error(self, tmp_path):
+        server = daemon.FrameServer(str(tmp_path / "gdq.sock"), FakeMarathon(), FakeRunner({}, []))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.connect(str(tmp_path / "gdq.sock"))
+                client.sendall(b'not json\n{"args": ["--nope"]}\n{"args": "-x"}\n{"width": 10, "height": 5}\n')
+                replies = client.makefile("rb")
+                errors = [json.loads(replies.readline()) for _ in range(3)]
+                frame = json.loads(replies.readline())
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert all("error" in error for error in errors)
+        assert errors[1] == {"error": "invalid args: --nope"}
+        assert frame["body"] == ["0", "1", "2"]
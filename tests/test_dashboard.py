@@ -0,0 +1,106 @@
+import argparse
+from datetime import datetime, timedelta, timezone
+
+import requests
+
+from gdq import dashboard, utils
+
+
+class FakeMarathon:
+    end = datetime.now(tz=timezone.utc) + timedelta(days=1)
+    refreshes = 0
+    error: Exception | None = None
+
+    def refresh_all(self):
+        self.refreshes += 1
+        if self.error:
+            raise self.error
+
+    def header(self, width, args):
+        yield "header".ljust(width)
+
+    def footer(self, width, args):
+        yield "footer".ljust(width)
+
+
+class EmptyMarathon(FakeMarathon):
+    schedule = ()
+
+    @property
+    def end(self):
+        return self.schedule[-1]
+
+
+def panel(name, marathon=None):
+    return dashboard.Panel(name=name, marathon=marathon or FakeMarathon(), args=argparse.Namespace())
+
+
+class TestPanel:
+    def test_loading(self):
+        assert panel("agdq").render(20) == ["──────┤ agdq ├──────", "Loading…".center(20)]
+
+    def test_refresh(self):
+        utils.update_now()
+        tile = panel("agdq")
+        tile.refresh()
+
+        assert tile.ready
+        assert tile.render(20)[1:] == ["header".ljust(20), "footer".ljust(20)]
+
+    def test_error(self):
+        marathon = FakeMarathon()
+        marathon.error = requests.ConnectionError("tracker is down")
+        tile = panel("agdq", marathon)
+        tile.refresh()
+
+        assert not tile.ready
+        assert tile.render(20)[1:] == ["tracker is down"]
+
+    def test_no_events(self):
+        marathon = FakeMarathon()
+        marathon.error = IndexError("Couldn't find any events")
+        tile = panel("agdq", marathon)
+        tile.refresh()
+
+        assert not tile.ready
+        assert tile.render(30)[1:] == ["Couldn't find any events"]
+
+    def test_empty_schedule(self):
+        utils.update_now()
+        tile = panel("horaro", EmptyMarathon())
+        tile.refresh()
+
+        assert tile.ready
+        assert tile.render(20)[1:] == ["tuple index out of r"]
+
+
+class TestDashboard:
+    def test_schedule(self):
+        panels = [panel("agdq"), panel("bus")]
+        board = dashboard.Dashboard(panels, interval=60)
+        board.schedule()
+        board.wait_ready()
+        # Nothing is due again until the interval has passed.
+        board.schedule()
+        board.wait_ready()
+
+        assert [tile.marathon.refreshes for tile in panels] == [1, 1]
+        assert all(tile.ready for tile in panels)
+
+    def test_tiling(self):
+        utils.update_now()
+        panels = [panel("agdq"), panel("bus"), panel("horaro")]
+        board = dashboard.Dashboard(panels, interval=60)
+        for tile in panels:
+            tile.refresh()
+
+        # Two tiles fit side by side, so the third starts a new row.
+        lines = board.render(2 * dashboard.TILE_WIDTH)
+        assert len(lines) == 6
+        assert all(len(line) == 2 * dashboard.TILE_WIDTH for line in lines[:3])
+        assert "agdq" in lines[0][:dashboard.TILE_WIDTH]
+        assert "bus" in lines[0][dashboard.TILE_WIDTH:]
+        assert "horaro" in lines[3]
+
+        # Too narrow for two, so every tile is stacked.
+        assert len(board.render(dashboard.TILE_WIDTH)) == 9
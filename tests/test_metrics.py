@@ -0,0 +1,39 @@
+from gdq import metrics
+
+
+class TestMetrics:
+    def test_counter(self):
+        counter = metrics.Counter("test_counter_total", "A test counter", registry=[])
+        counter.inc(cache="horaro", result="hit")
+        counter.inc(2, cache="horaro", result="hit")
+
+        assert list(counter.expose()) == [
+            "# HELP test_counter_total A test counter",
+            "# TYPE test_counter_total counter",
+            'test_counter_total{cache="horaro",result="hit"} 3',
+        ]
+
+    def test_histogram(self):
+        histogram = metrics.Histogram("test_seconds", "A test histogram", buckets=(0.1, 1.0), registry=[])
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5)
+
+        assert list(histogram.samples()) == [
+            'test_seconds_bucket{le="0.1"} 1',
+            'test_seconds_bucket{le="1.0"} 2',
+            'test_seconds_bucket{le="+Inf"} 3',
+            "test_seconds_sum 5.55",
+            "test_seconds_count 3",
+        ]
+
+    def test_render(self):
+        assert "# TYPE process_resident_memory_bytes gauge" in metrics.render()
+        assert metrics.resident_memory() > 0
+
+    def test_registry(self):
+        registry: list[metrics.Metric] = []
+        counter = metrics.Counter("test_registered_total", "A test counter", registry=registry)
+
+        assert registry == [counter]
+        assert counter not in metrics.REGISTRY
@@ -0,0 +1,38 @@
+from gdq.polling import Poller
+
+
+class FakeMarathon:
+    def __init__(self):
+        self.has_changed = False
+        self.soon: float | None = None
+
+    def changed(self) -> bool:
+        return self.has_changed
+
+    def urgency(self) -> float | None:
+        return self.soon
+
+
+class TestPoller:
+    def test_backoff(self):
+        marathon = FakeMarathon()
+        poller = Poller(10, 60)
+
+        assert [poller.update(marathon) for _ in range(4)] == [20, 40, 60, 60]
+        marathon.has_changed = True
+        assert [poller.update(marathon) for _ in range(3)] == [30, 15, 10]
+
+    def test_urgency(self):
+        marathon = FakeMarathon()
+        poller = Poller(10, 60)
+        for _ in range(3):
+            poller.update(marathon)
+
+        marathon.soon = 25
+        assert poller.update(marathon) == 25
+        marathon.soon = 0
+        assert poller.update(marathon) == 10
+
+    def test_fixed(self):
+        poller = Poller(60, 60)
+        assert poller.update(FakeMarathon()) == 60
@@ -0,0 +1,60 @@
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from gdq import metrics, transport
+
+DOCUMENT = {"results": [{"name": f"Bid war {n}", "total": n * 100} for n in range(200)]}
+
+
+class GzipHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        body = json.dumps(DOCUMENT).encode()
+        compress = "gzip" in self.headers.get("Accept-Encoding", "")
+        if compress:
+            body = gzip.compress(body)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if compress:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture()
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), GzipHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/search"
+    server.shutdown()
+
+
+class TestTransport:
+    def test_compressed_transfer(self, server, monkeypatch):
+        monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+        monkeypatch.setattr(transport, "_transfers", {})
+        decoded_bytes = metrics.Counter("test_decoded_bytes_total", "Decoded bytes", registry=[])
+        monkeypatch.setattr(metrics, "WIRE_BYTES", metrics.Counter("test_wire_bytes_total", "Wire bytes", registry=[]))
+        monkeypatch.setattr(metrics, "DECODED_BYTES", decoded_bytes)
+        monkeypatch.setattr(metrics, "FETCH_SECONDS", metrics.Histogram("test_seconds", "Fetch time", registry=[]))
+
+        assert transport.get(server, "test-bids").json() == DOCUMENT
+
+        transfer = transport.transfers()["test-bids"]
+        decoded = len(json.dumps(DOCUMENT).encode())
+        assert transfer.requests == 1
+        assert transfer.decoded == decoded
+        assert transfer.wire == len(gzip.compress(json.dumps(DOCUMENT).encode()))
+        assert transfer.saved > 0.5
+        assert list(decoded_bytes.samples()) == [f'test_decoded_bytes_total{{resource="test-bids"}} {decoded}']
+
+    def test_saved(self):
+        assert transport.Transfer(1, 25, 100).saved == 0.75
+        assert transport.Transfer().saved == 0.0